@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from posts.models import Follow
+
+User = get_user_model()
+
+
+class ApiViewsTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.user = mixer.blend(User)
+        cls.author = mixer.blend(User)
+        cls.group = mixer.blend('posts.Group')
+        cls.posts = mixer.cycle(settings.NUM_OBJECTS_ON_PAGE + 1).blend(
+            'posts.Post',
+            author=cls.author,
+            group=cls.group,
+            image='',
+        )
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = Client()
+
+    def test_index_shape(self) -> None:
+        """Лента отдаёт только нужные поля поста."""
+        response = self.client.get(reverse('api:index'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = response.json()
+        post = self.posts[-1]
+        self.assertEqual(
+            data['results'][0],
+            {
+                'id': post.pk,
+                'text': post.text,
+                'created': data['results'][0]['created'],
+                'author': self.author.username,
+                'group': self.group.slug,
+                'thumbnail': post.thumbnail_url,
+                'comments': 0,
+            },
+        )
+        self.assertIsNone(data['previous'])
+
+    def test_cursor(self) -> None:
+        """Следующая страница открывается по курсору из ответа."""
+        url = reverse('api:group_list', args=(self.group.slug,))
+        first = self.client.get(url).json()
+        self.assertEqual(
+            len(first['results']),
+            settings.NUM_OBJECTS_ON_PAGE,
+        )
+        second = self.client.get(url, {'cursor': first['next']}).json()
+        self.assertEqual(
+            [post['id'] for post in second['results']],
+            [self.posts[0].pk],
+        )
+        self.assertIsNone(second['next'])
+        self.assertIsNotNone(second['previous'])
+
+    def test_cached_index_keeps_content_type(self) -> None:
+        """Ответ из кэша остаётся JSON."""
+        self.client.get(reverse('api:index'))
+        response = self.client.get(reverse('api:index'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_post_detail(self) -> None:
+        """Пост отдаётся вместе со страницей комментариев."""
+        post = self.posts[0]
+        comment = mixer.blend('posts.Comment', post=post)
+        data = self.client.get(
+            reverse('api:post_detail', args=(post.pk,)),
+        ).json()
+        self.assertEqual(data['post']['id'], post.pk)
+        self.assertEqual(
+            data['comments']['results'][0]['author'],
+            comment.author.username,
+        )
+
+    def test_cached_post_detail_invalidated(self) -> None:
+        """Пост из кэша обновляется после нового комментария."""
+        post = self.posts[0]
+        url = reverse('api:post_detail', args=(post.pk,))
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        comment = mixer.blend('posts.Comment', post=post)
+        data = self.client.get(url).json()
+        self.assertEqual(data['comments']['results'][0]['id'], comment.pk)
+
+    def test_not_found(self) -> None:
+        """Несуществующие объекты возвращают 404 в JSON."""
+        for url in (
+            reverse('api:post_detail', args=(0,)),
+            reverse('api:group_list', args=('missing',)),
+            reverse('api:profile', args=('missing',)),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+                self.assertIn('detail', response.json())
+
+    def test_follow_index(self) -> None:
+        """Лента подписок доступна только авторизованным."""
+        url = reverse('api:follow_index')
+        self.assertEqual(
+            self.client.get(url).status_code,
+            HTTPStatus.UNAUTHORIZED,
+        )
+        self.client.force_login(self.user)
+        data = self.client.get(url).json()
+        self.assertEqual(
+            len(data['results']),
+            settings.NUM_OBJECTS_ON_PAGE,
+        )
+        self.assertEqual(data['results'][0]['author'], self.author.username)
+
+    def test_follow_cursor(self) -> None:
+        """Лента подписок листается по курсору."""
+        mixer.blend(Follow, author=self.author)
+        self.client.force_login(self.user)
+        url = reverse('api:follow_index')
+        first = self.client.get(url).json()
+        second = self.client.get(url, {'cursor': first['next']}).json()
+        self.assertEqual(
+            [post['id'] for post in second['results']],
+            [self.posts[0].pk],
+        )
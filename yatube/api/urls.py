@@ -0,0 +1,38 @@
+from django.urls import path
+
+from api import views
+
+app_name = '%(app_label)s'
+
+urlpatterns = [
+    path(
+        'posts/',
+        views.index,
+        name='index',
+    ),
+    path(
+        'posts/popular/',
+        views.popular,
+        name='popular',
+    ),
+    path(
+        'posts/<int:pk>/',
+        views.post_detail,
+        name='post_detail',
+    ),
+    path(
+        'groups/<slug:slug>/posts/',
+        views.group_posts,
+        name='group_list',
+    ),
+    path(
+        'profiles/<str:username>/posts/',
+        views.profile,
+        name='profile',
+    ),
+    path(
+        'follow/',
+        views.follow_index,
+        name='follow_index',
+    ),
+]
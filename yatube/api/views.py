@@ -0,0 +1,188 @@
+from http import HTTPStatus
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db.models.query import QuerySet
+from django.http import HttpRequest, JsonResponse
+from django.views.decorators.http import condition
+
+from core import objects
+from core.cache import cache_page_on
+from core.utils import KeysetPage, KeysetPaginator, paginate
+from posts import conditions, feed, ranking
+from posts.models import Comment, Group, Post, User
+
+POST_FIELDS = (
+    'pk',
+    'text',
+    'created',
+    'comments_count',
+    'author__username',
+    'group__slug',
+    'thumbnail_url',
+)
+
+COMMENT_FIELDS = ('pk', 'text', 'created', 'author__username')
+
+
+def values_page(
+    request: HttpRequest,
+    queryset: QuerySet,
+    fields: Iterable[str],
+    per_page: int = settings.NUM_OBJECTS_ON_PAGE,
+) -> KeysetPage:
+    """Возвращает страницу словарей из values() по курсору.
+
+    В выборку добавляются поля сортировки, из которых строится курсор.
+
+    Args:
+        request: Объект запроса.
+        queryset: QuerySet, который необходимо разбить на страницы.
+        fields: Поля для values().
+        per_page: Максимальное количество элементов на странице.
+
+    Returns:
+        Объект KeysetPage.
+    """
+    names = KeysetPaginator(queryset, per_page).names
+    return paginate(
+        request,
+        queryset.values(*dict.fromkeys((*fields, *names))),
+        per_page,
+        keyset=True,
+    )
+
+
+def post_data(row: dict) -> dict:
+    return {
+        'id': row['pk'],
+        'text': row['text'],
+        'created': row['created'],
+        'author': row['author__username'],
+        'group': row['group__slug'],
+        'thumbnail': row['thumbnail_url'] or None,
+        'comments': row['comments_count'],
+    }
+
+
+def comment_data(row: dict) -> dict:
+    return {
+        'id': row['pk'],
+        'text': row['text'],
+        'created': row['created'],
+        'author': row['author__username'],
+    }
+
+
+def page_data(page: KeysetPage, serialize: Callable[[dict], dict]) -> dict:
+    return {
+        'results': [serialize(row) for row in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    }
+
+
+def json_response(data: dict, status: int = HTTPStatus.OK) -> JsonResponse:
+    return JsonResponse(
+        data,
+        status=status,
+        json_dumps_params={'ensure_ascii': False, 'separators': (',', ':')},
+    )
+
+
+def not_found() -> JsonResponse:
+    return json_response({'detail': 'Не найдено.'}, HTTPStatus.NOT_FOUND)
+
+
+@cache_page_on('index_page')
+def index(request: HttpRequest) -> JsonResponse:
+    return json_response(
+        page_data(
+            values_page(request, Post.objects.all(), POST_FIELDS),
+            post_data,
+        ),
+    )
+
+
+@cache_page_on('popular_page')
+def popular(request: HttpRequest) -> JsonResponse:
+    return json_response(
+        page_data(
+            values_page(request, ranking.get_popular(), POST_FIELDS),
+            post_data,
+        ),
+    )
+
+
+@condition(etag_func=conditions.group_etag)
+@cache_page_on('index_page')
+def group_posts(request: HttpRequest, slug: str) -> JsonResponse:
+    group = objects.get(Group, slug=slug)
+    if group is None:
+        return not_found()
+    return json_response(
+        page_data(
+            values_page(
+                request,
+                Post.objects.filter(group=group),
+                POST_FIELDS,
+            ),
+            post_data,
+        ),
+    )
+
+
+@condition(etag_func=conditions.profile_etag)
+@cache_page_on('index_page')
+def profile(request: HttpRequest, username: str) -> JsonResponse:
+    author = objects.get(User, username=username)
+    if author is None:
+        return not_found()
+    return json_response(
+        page_data(
+            values_page(
+                request,
+                Post.objects.filter(author=author),
+                POST_FIELDS,
+            ),
+            post_data,
+        ),
+    )
+
+
+@condition(etag_func=conditions.post_detail_etag)
+@cache_page_on('post_page')
+def post_detail(request: HttpRequest, pk: int) -> JsonResponse:
+    if objects.get(Post, pk=pk) is None:
+        return not_found()
+    post = Post.objects.filter(pk=pk).values(*POST_FIELDS).first()
+    if post is None:
+        return not_found()
+    return json_response(
+        {
+            'post': post_data(post),
+            'comments': page_data(
+                values_page(
+                    request,
+                    Comment.objects.filter(post_id=pk),
+                    COMMENT_FIELDS,
+                    settings.NUM_COMMENTS_ON_PAGE,
+                ),
+                comment_data,
+            ),
+        },
+    )
+
+
+def follow_index(request: HttpRequest) -> JsonResponse:
+    if not request.user.is_authenticated:
+        return json_response(
+            {'detail': 'Требуется авторизация.'},
+            HTTPStatus.UNAUTHORIZED,
+        )
+    return json_response(
+        page_data(
+            values_page(request, feed.get_feed(request.user), POST_FIELDS),
+            post_data,
+        ),
+    )
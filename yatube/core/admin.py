@@ -1,5 +1,96 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
+from django.utils.functional import cached_property
+
+from core.models import Batch, Task
+
+
+def estimate_rows(queryset: QuerySet) -> int:
+    """Оценивает число строк таблицы по статистике SQLite.
+
+    Статистику собирает ANALYZE или PRAGMA optimize.
+
+    Args:
+        queryset: QuerySet таблицы.
+
+    Returns:
+        Оценка числа строк или 0, если статистики нет.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'sqlite':
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM sqlite_master WHERE name = %s',
+            ('sqlite_stat1',),
+        )
+        if cursor.fetchone() is None:
+            return 0
+        cursor.execute(
+            'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+            (queryset.model._meta.db_table,),
+        )
+        row = cursor.fetchone()
+    return int(row[0].split()[0]) if row else 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который не считает большие таблицы целиком.
+
+    Для таблицы без фильтров число строк берётся из статистики, если
+    оно больше ADMIN_COUNT_LIMIT. Иначе строки считаются, но не
+    дальше ADMIN_COUNT_LIMIT.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_rows(queryset)
+            if estimate > settings.ADMIN_COUNT_LIMIT:
+                return estimate
+        return queryset.order_by()[: settings.ADMIN_COUNT_LIMIT].count()
 
 
 class BaseAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Task)
+class TaskAdmin(BaseAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_at', 'created')
+    list_filter = ('status', 'name')
+    readonly_fields = ('started', 'last_error')
+
+
+@admin.register(Batch)
+class BatchAdmin(BaseAdmin):
+    list_display = ('pk', 'description', 'progress', 'user', 'created')
+    list_select_related = ('user',)
+    exclude = ('ids', 'options')
+    readonly_fields = (
+        'action',
+        'description',
+        'total',
+        'done',
+        'user',
+        'finished',
+    )
+
+    def progress(self, obj: Batch) -> str:
+        if obj.finished:
+            return 'завершена'
+        if not obj.total:
+            return '0%'
+        return f'{obj.done * 100 // obj.total}%'
+
+    progress.short_description = 'выполнено'
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     name = 'core'
     verbose_name = 'служебное'
+
+    def ready(self) -> None:
+        from core import signals  # noqa: F401
+
+        autodiscover_modules('tasks')
@@ -0,0 +1,33 @@
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from core.models import User
+
+
+def user_key(user_id: Any) -> str:
+    return f'user:{user_id}'
+
+
+def forget_user(user_id: Any) -> None:
+    cache.delete(user_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя из общего кэша.
+
+    AuthenticationMiddleware загружает пользователя на каждом запросе.
+    Запись в кэше удаляется при сохранении и удалении пользователя и
+    при выходе, поэтому смена пароля сразу завершает чужие сессии.
+    """
+
+    def get_user(self, user_id: Any) -> Optional[User]:
+        key = user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
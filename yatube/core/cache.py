@@ -0,0 +1,208 @@
+import re
+import time
+from functools import wraps
+from hashlib import md5
+from http import HTTPStatus
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.utils.encoding import force_bytes
+
+from core.routers import pin_primary
+
+HOLE = re.compile(rb'<!--hole:([\w.:=-]+)-->')
+HOLE_SALT = 'core.cache.hole'
+
+
+def get_generation(name: str) -> int:
+    """Возвращает текущее поколение группы кэшированных данных.
+
+    Начальное значение берётся от текущего времени, чтобы после
+    вытеснения ключа не совпасть с одним из прошлых поколений.
+
+    Args:
+        name: Название группы данных.
+
+    Returns:
+        Номер поколения.
+    """
+    key = f'generation:{name}'
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, int(time.time() * 1000), None)
+        return cache.get(key)
+    return generation
+
+
+def bump_generation(*names: str) -> None:
+    """Объявляет устаревшими все данные, закэшированные для групп.
+
+    Args:
+        names: Названия групп данных.
+    """
+    for name in names:
+        try:
+            cache.incr(f'generation:{name}')
+        except ValueError:
+            get_generation(name)
+    cache.set_many(
+        {f'generation:{name}:changed': True for name in names},
+        settings.REPLICA_STICKY_TIMEOUT,
+    )
+
+
+def recently_changed(name: str) -> bool:
+    """Проверяет, менялись ли данные группы за REPLICA_STICKY_TIMEOUT.
+
+    Реплики могли ещё не получить эти изменения, поэтому данные для
+    кэша в это время читаются из основной базы.
+
+    Args:
+        name: Название группы данных.
+    """
+    return cache.get(f'generation:{name}:changed', False)
+
+
+def single_flight(
+    key: str,
+    stale_key: str,
+    compute: Callable[[], Any],
+    timeout: int = settings.CACHE_TIMEOUT,
+) -> Any:
+    """Возвращает значение из кэша, пересчитывая его не более одного раза.
+
+    Пересчёт выполняет только тот запрос, который взял блокировку.
+    Остальные получают прошлое значение из stale_key, а если его нет —
+    ждут, пока значение появится.
+
+    Args:
+        key: Ключ актуального значения.
+        stale_key: Ключ последнего вычисленного значения.
+        compute: Функция пересчёта; None не кэшируется.
+        timeout: Время жизни актуального значения.
+
+    Returns:
+        Значение из кэша или результат compute.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, True, settings.CACHE_LOCK_TIMEOUT):
+        value = cache.get(stale_key)
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while value is None and time.monotonic() < deadline:
+            time.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+            value = cache.get(key)
+        if value is not None:
+            return value
+    try:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, timeout)
+            cache.set(stale_key, value, settings.CACHE_STALE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+def punch_hole(template_name: str, context: dict) -> str:
+    """Возвращает метку на месте фрагмента, зависящего от пользователя.
+
+    Args:
+        template_name: Шаблон фрагмента.
+        context: Контекст фрагмента; значения должны сериализоваться
+            в JSON.
+
+    Returns:
+        HTML-комментарий с подписанными шаблоном и контекстом.
+    """
+    data = signing.dumps([template_name, context], salt=HOLE_SALT)
+    return f'<!--hole:{data}-->'
+
+
+def fill_holes(content: bytes, request: HttpRequest) -> bytes:
+    """Отрисовывает для текущего пользователя фрагменты на месте меток.
+
+    Args:
+        content: Страница с метками из punch_hole.
+        request: Объект запроса.
+
+    Returns:
+        Страница без меток. Метки с неверной подписью удаляются.
+    """
+
+    def render(match: re.Match) -> bytes:
+        try:
+            template_name, context = signing.loads(
+                match[1].decode(),
+                salt=HOLE_SALT,
+            )
+        except signing.BadSignature:
+            return b''
+        return render_to_string(template_name, context, request).encode()
+
+    return HOLE.sub(render, content)
+
+
+def cache_page_on(
+    generation: str,
+    timeout: int = settings.CACHE_TIMEOUT,
+) -> Callable:
+    """Кэширует страницу до смены поколения данных.
+
+    Страница кэшируется одна для всех пользователей. Фрагменты,
+    которые зависят от пользователя, выводятся тегом personal и
+    отрисовываются при каждом ответе.
+
+    Args:
+        generation: Название группы данных, от которой зависит страница.
+        timeout: Время жизни страницы в кэше.
+
+    Returns:
+        Декоратор представления.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            url = md5(force_bytes(request.get_full_path())).hexdigest()
+            suffix = f'{generation}:{url}'
+            request.punch_holes = True
+            rendered = []
+
+            def render() -> Any:
+                # Страница попадёт в кэш нового поколения, поэтому её
+                # нельзя строить по реплике, отставшей от изменений.
+                with pin_primary(recently_changed(generation)):
+                    response = view(request, *args, **kwargs)
+                rendered.append(response)
+                if response.status_code != HTTPStatus.OK:
+                    return None
+                return response['Content-Type'], response.content
+
+            cached = single_flight(
+                f'view:{get_generation(generation)}:{suffix}',
+                f'view:stale:{suffix}',
+                render,
+                timeout,
+            )
+            if rendered:
+                response = rendered[0]
+                response.content = fill_holes(response.content, request)
+                return response
+            content_type, content = cached
+            return HttpResponse(
+                fill_holes(content, request),
+                content_type=content_type,
+            )
+
+        return wrapper
+
+    return decorator
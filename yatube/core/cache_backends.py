@@ -0,0 +1,249 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Время последнего чтения обновляется не чаще, чем раз в столько
+# секунд, чтобы чтение горячих ключей не превращалось в запись.
+ACCESS_RESOLUTION = 30
+
+
+class SQLiteCache(BaseCache):
+    """Кэш в файле SQLite, общий для всех процессов на сервере.
+
+    При превышении MAX_ENTRIES или MAX_SIZE (в байтах) вытесняются
+    записи, которые дольше всего не читались.
+    """
+
+    def __init__(self, location: str, params: dict) -> None:
+        super().__init__(params)
+        self._path = location
+        self._max_size = params.get('OPTIONS', {}).get('MAX_SIZE')
+        self._local = threading.local()
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # Соединение нельзя переносить между потоками и через fork.
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(
+                self._path,
+                timeout=30,
+                isolation_level=None,
+            )
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            self._create_tables(connection)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    @staticmethod
+    def _create_tables(connection: sqlite3.Connection) -> None:
+        # Число и объём записей хранятся в отдельной строке и
+        # обновляются триггерами, чтобы проверка лимитов при каждой
+        # записи не просматривала всю таблицу.
+        connection.executescript(
+            '''
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY, value BLOB NOT NULL,
+                expires REAL, accessed REAL NOT NULL,
+                size INTEGER NOT NULL);
+            CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed);
+            CREATE TABLE IF NOT EXISTS cache_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                count INTEGER NOT NULL, size INTEGER NOT NULL);
+            INSERT OR IGNORE INTO cache_stats
+                SELECT 0, COUNT(*), TOTAL(size) FROM cache;
+            CREATE TRIGGER IF NOT EXISTS cache_insert
+                AFTER INSERT ON cache BEGIN
+                UPDATE cache_stats
+                SET count = count + 1, size = size + NEW.size;
+                END;
+            CREATE TRIGGER IF NOT EXISTS cache_update
+                AFTER UPDATE OF size ON cache BEGIN
+                UPDATE cache_stats SET size = size - OLD.size + NEW.size;
+                END;
+            CREATE TRIGGER IF NOT EXISTS cache_delete
+                AFTER DELETE ON cache BEGIN
+                UPDATE cache_stats
+                SET count = count - 1, size = size - OLD.size;
+                END;
+            COMMIT;
+            ''',
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE сразу берёт блокировку на запись, поэтому
+        # чтение и запись внутри транзакции атомарны между процессами.
+        connection = self._connection
+        connection.execute('BEGIN IMMEDIATE')
+        with connection:
+            yield connection
+
+    def _key(self, key: str, version: Optional[int]) -> str:
+        key = self.make_key(key, version)
+        self.validate_key(key)
+        return key
+
+    def _row(self, key: str, now: float) -> Optional[tuple]:
+        return self._connection.execute(
+            'SELECT value, accessed FROM cache '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, now),
+        ).fetchone()
+
+    def get(
+        self,
+        key: str,
+        default: Any = None,
+        version: Optional[int] = None,
+    ) -> Any:
+        key = self._key(key, version)
+        now = time.time()
+        row = self._row(key, now)
+        if row is None:
+            return default
+        if row[1] < now - ACCESS_RESOLUTION:
+            self._connection.execute(
+                'UPDATE cache SET accessed = ? WHERE key = ?',
+                (now, key),
+            )
+        return pickle.loads(row[0])
+
+    def _store(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any,
+        only_missing: bool = False,
+    ) -> bool:
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._transaction() as connection:
+            if only_missing and self._row(key, now):
+                return False
+            # REPLACE удаляет старую строку без триггера удаления,
+            # поэтому существующая запись обновляется.
+            connection.execute(
+                'INSERT INTO cache (key, value, expires, accessed, size) '
+                'VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET '
+                'value = excluded.value, expires = excluded.expires, '
+                'accessed = excluded.accessed, size = excluded.size',
+                (
+                    key,
+                    value,
+                    self.get_backend_timeout(timeout),
+                    now,
+                    len(key) + len(value),
+                ),
+            )
+            self._cull(now)
+            return True
+
+    def _cull(self, now: float) -> None:
+        connection = self._connection
+        count, size = connection.execute(
+            'SELECT count, size FROM cache_stats',
+        ).fetchone()
+        too_big = self._max_size and size > self._max_size
+        if count <= self._max_entries and not too_big:
+            return
+        connection.execute('DELETE FROM cache WHERE expires <= ?', (now,))
+        if self._cull_frequency == 0:
+            connection.execute('DELETE FROM cache')
+            return
+        if count > self._max_entries:
+            connection.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM cache ORDER BY accessed LIMIT ?)',
+                (count // self._cull_frequency,),
+            )
+        if too_big:
+            # Оставляем самые свежие записи, пока их объём не превысит
+            # доли лимита, чтобы не чистить кэш на каждой записи.
+            connection.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM ('
+                'SELECT key, SUM(size) OVER (ORDER BY accessed DESC) '
+                'AS total FROM cache) WHERE total > ?)',
+                (self._max_size * (1 - 1 / self._cull_frequency),),
+            )
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        self._store(self._key(key, version), value, timeout)
+
+    def add(
+        self,
+        key: str,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        return self._store(
+            self._key(key, version),
+            value,
+            timeout,
+            only_missing=True,
+        )
+
+    def touch(
+        self,
+        key: str,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        cursor = self._connection.execute(
+            'UPDATE cache SET expires = ? '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (
+                self.get_backend_timeout(timeout),
+                self._key(key, version),
+                time.time(),
+            ),
+        )
+        return bool(cursor.rowcount)
+
+    def incr(
+        self,
+        key: str,
+        delta: int = 1,
+        version: Optional[int] = None,
+    ) -> int:
+        key = self._key(key, version)
+        with self._transaction() as connection:
+            row = self._row(key, time.time())
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            connection.execute(
+                'UPDATE cache SET value = ?, size = ? WHERE key = ?',
+                (data, len(key) + len(data), key),
+            )
+            return value
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        cursor = self._connection.execute(
+            'DELETE FROM cache WHERE key = ?',
+            (self._key(key, version),),
+        )
+        return bool(cursor.rowcount)
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        return self._row(self._key(key, version), time.time()) is not None
+
+    def clear(self) -> None:
+        self._connection.execute('DELETE FROM cache')
@@ -0,0 +1,15 @@
+from typing import List
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+
+from core.tasks import send_email, serialize_messages
+
+
+class TaskEmailBackend(BaseEmailBackend):
+    """Отправляет письма из фоновой задачи, а не во время запроса."""
+
+    def send_messages(self, email_messages: List[EmailMessage]) -> int:
+        if email_messages:
+            send_email.delay(serialize_messages(list(email_messages)))
+        return len(email_messages)
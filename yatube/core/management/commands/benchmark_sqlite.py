@@ -0,0 +1,98 @@
+import sqlite3
+import tempfile
+import time
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Настройки SQLite по умолчанию: журнал отката, ожидание блокировки
+# не дольше 5 секунд и новое соединение на каждый запрос.
+DEFAULT_PROFILE: Dict[str, object] = {}
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS post ('
+    'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+    'text TEXT NOT NULL, created TEXT NOT NULL)'
+)
+
+
+def connect(path: str, pragmas: Dict[str, object]) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, isolation_level=None)
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+    return connection
+
+
+def work(args: Tuple[str, Dict[str, object], bool, int]) -> Tuple[int, int]:
+    """Выполняет запросы одного обработчика.
+
+    Каждый запрос читает последние записи и добавляет новую, как
+    публикация поста.
+
+    Returns:
+        Число успешных записей и ошибок «database is locked».
+    """
+    path, pragmas, persistent, requests = args
+    written = failed = 0
+    connection = connect(path, pragmas) if persistent else None
+    for number in range(requests):
+        current = connection or connect(path, pragmas)
+        try:
+            current.execute(
+                'SELECT id, text FROM post ORDER BY id DESC LIMIT 10',
+            ).fetchall()
+            current.execute(
+                'INSERT INTO post (text, created) '
+                "VALUES (?, datetime('now'))",
+                (f'Пост {number}',),
+            )
+            written += 1
+        except sqlite3.OperationalError:
+            failed += 1
+        finally:
+            if not persistent:
+                current.close()
+    return written, failed
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает число записей в секунду у SQLite с настройками по '
+        'умолчанию и с SQLITE_PRAGMAS при нескольких процессах.'
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Число запросов на один процесс.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        profiles = (
+            ('по умолчанию', DEFAULT_PROFILE, False),
+            ('SQLITE_PRAGMAS', settings.SQLITE_PRAGMAS, True),
+        )
+        for title, pragmas, persistent in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = str(Path(directory) / 'benchmark.sqlite3')
+                connect(path, pragmas).execute(SCHEMA).connection.close()
+                start = time.perf_counter()
+                with Pool(options['workers']) as pool:
+                    results = pool.map(
+                        work,
+                        [(path, pragmas, persistent, options['requests'])]
+                        * options['workers'],
+                    )
+                elapsed = time.perf_counter() - start
+            written = sum(result[0] for result in results)
+            failed = sum(result[1] for result in results)
+            self.stdout.write(
+                f'{title:<16} {written / elapsed:10.1f} записей/с, '
+                f'ошибок блокировки: {failed}',
+            )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from core import profiling
+
+
+class Command(BaseCommand):
+    help = 'Выводит перцентили времени ответа и SQL-запросов по URL.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Удалить накопленную статистику.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options['reset']:
+            profiling.reset()
+            self.stdout.write(self.style.SUCCESS('Статистика удалена.'))
+            return
+        for name, stats in profiling.stats().items():
+            heading = f'{name} (запросов: {stats["count"]})'
+            self.stdout.write(self.style.MIGRATE_HEADING(heading))
+            for metric in profiling.METRICS:
+                values = ', '.join(
+                    f'p{percent}={value:.3f}'
+                    for percent, value in stats[metric].items()
+                )
+                self.stdout.write(f'  {metric}: {values}')
@@ -0,0 +1,58 @@
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.models import Task
+from core.tasks import claim, execute, prune
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.TASKS_WORKERS,
+            help='Число задач, выполняемых одновременно.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        workers = options['workers']
+        stop = threading.Event()
+        if not options['once']:
+            signal.signal(signal.SIGINT, lambda *args: stop.set())
+            signal.signal(signal.SIGTERM, lambda *args: stop.set())
+        claimed = 0
+        with ThreadPoolExecutor(workers) as pool:
+            running = set()
+            while not stop.is_set():
+                running = {future for future in running if not future.done()}
+                free = workers - len(running)
+                jobs = claim(free) if free else []
+                running.update(pool.submit(self.run, job) for job in jobs)
+                claimed += len(jobs)
+                if options['once'] and not running and not jobs:
+                    break
+                if not jobs:
+                    prune()
+                    stop.wait(settings.TASKS_POLL_INTERVAL)
+        self.stdout.write(
+            self.style.SUCCESS(f'Выполнено задач: {claimed}.'),
+        )
+
+    @staticmethod
+    def run(job: Task) -> None:
+        try:
+            execute(job)
+        finally:
+            connection.close()
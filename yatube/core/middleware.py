@@ -0,0 +1,79 @@
+import time
+from contextlib import ExitStack
+from typing import Callable
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from core import profiling, routers
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class ProfilingMiddleware:
+    """Замеряет число и время SQL-запросов, отрисовку шаблонов и
+    общее время ответа каждого представления.
+
+    Запросы, превысившие PROFILING_MAX_QUERIES или
+    PROFILING_MAX_DURATION, записываются в журнал.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        profile = profiling.start()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            profiling.stop()
+        profile.duration = time.perf_counter() - start
+        match = request.resolver_match
+        name = match.view_name if match else 'unresolved'
+        if profile.over_budget():
+            profiling.logger.warning(
+                '%s %s: %d SQL-запросов за %.3f с, шаблоны %.3f с, '
+                'всего %.3f с',
+                name,
+                request.get_full_path(),
+                profile.queries,
+                profile.sql_time,
+                profile.template_time,
+                profile.duration,
+            )
+        profiling.record(name, profile)
+        return response
+
+
+class PrimaryPinMiddleware:
+    """Обеспечивает чтение своих записей при работе с репликами.
+
+    Запросы, изменяющие данные, выполняются целиком в основной базе и
+    ставят cookie, из-за которой следующие REPLICA_STICKY_TIMEOUT
+    секунд запросы этого пользователя тоже читают из основной базы,
+    пока реплики догоняют изменения. Cookie ставят и GET-запросы,
+    отмеченные routers.mark_written.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        writes = request.method not in SAFE_METHODS
+        pin = writes or settings.REPLICA_STICKY_COOKIE in request.COOKIES
+        with routers.pin_primary(pin):
+            response = self.get_response(request)
+        if writes or getattr(request, 'primary_written', False):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_TIMEOUT,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,91 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'name',
+                    models.CharField(max_length=255, verbose_name='задача'),
+                ),
+                (
+                    'payload',
+                    models.TextField(default='{}', verbose_name='аргументы'),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('pending', 'в очереди'),
+                            ('running', 'выполняется'),
+                            ('done', 'выполнена'),
+                            ('failed', 'ошибка'),
+                        ],
+                        default='pending',
+                        max_length=10,
+                        verbose_name='статус',
+                    ),
+                ),
+                (
+                    'attempts',
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name='попыток'
+                    ),
+                ),
+                (
+                    'run_at',
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name='запустить после',
+                    ),
+                ),
+                (
+                    'started',
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name='начата'
+                    ),
+                ),
+                (
+                    'last_error',
+                    models.TextField(
+                        blank=True, verbose_name='последняя ошибка'
+                    ),
+                ),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='создана'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'фоновая задача',
+                'verbose_name_plural': 'фоновые задачи',
+                'ordering': ('-created',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(
+                fields=['status', 'run_at'], name='core_task_status_5742ae_idx'
+            ),
+        ),
+    ]
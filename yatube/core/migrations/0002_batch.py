@@ -0,0 +1,78 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0001_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Batch',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'action',
+                    models.CharField(
+                        max_length=255, verbose_name='задача порции'
+                    ),
+                ),
+                (
+                    'description',
+                    models.CharField(max_length=255, verbose_name='описание'),
+                ),
+                ('ids', models.TextField(verbose_name='объекты')),
+                (
+                    'options',
+                    models.TextField(default='{}', verbose_name='параметры'),
+                ),
+                ('total', models.PositiveIntegerField(verbose_name='всего')),
+                (
+                    'done',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='обработано'
+                    ),
+                ),
+                (
+                    'created',
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name='создана'
+                    ),
+                ),
+                (
+                    'finished',
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name='завершена'
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='запустил',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'пакетная операция',
+                'verbose_name_plural': 'пакетные операции',
+                'ordering': ('-created',),
+            },
+        ),
+    ]
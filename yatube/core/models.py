@@ -1,6 +1,7 @@
 from behaviors.behaviors import Timestamped
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -22,6 +23,74 @@ class TimestampedModel(DefaultModel, Timestamped):
         super().__init__(*args, **kwargs)
         self._meta.get_field('created').verbose_name = 'дата публикации'
 
+    def save(self, *args, **kwargs) -> None:
+        # Обработчики post_save, например счётчики, выполняются
+        # в одной транзакции с сохранением.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         abstract = True
         ordering = ('-created',)
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'в очереди'),
+        (RUNNING, 'выполняется'),
+        (DONE, 'выполнена'),
+        (FAILED, 'ошибка'),
+    )
+
+    name = models.CharField('задача', max_length=255)
+    payload = models.TextField('аргументы', default='{}')
+    status = models.CharField(
+        'статус',
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('попыток', default=0)
+    run_at = models.DateTimeField('запустить после', default=timezone.now)
+    started = models.DateTimeField('начата', null=True, blank=True)
+    last_error = models.TextField('последняя ошибка', blank=True)
+    created = models.DateTimeField('создана', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'фоновые задачи'
+        ordering = ('-created',)
+        indexes = (models.Index(fields=('status', 'run_at')),)
+
+    def __str__(self) -> str:
+        return f'{self.name} ({self.get_status_display()})'
+
+
+class Batch(models.Model):
+    action = models.CharField('задача порции', max_length=255)
+    description = models.CharField('описание', max_length=255)
+    ids = models.TextField('объекты')
+    options = models.TextField('параметры', default='{}')
+    total = models.PositiveIntegerField('всего')
+    done = models.PositiveIntegerField('обработано', default=0)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name='запустил',
+    )
+    created = models.DateTimeField('создана', auto_now_add=True)
+    finished = models.DateTimeField('завершена', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'пакетная операция'
+        verbose_name_plural = 'пакетные операции'
+        ordering = ('-created',)
+
+    def __str__(self) -> str:
+        return f'{self.description} ({self.done}/{self.total})'
@@ -0,0 +1,134 @@
+from typing import Any, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.http import Http404
+
+from core.routers import pin_primary, pinned
+
+# Значение в кэше для ключа, по которому объекта нет в базе.
+MISSING = 'object:missing'
+# Значение в кэше для ключа недавно изменённого объекта: реплики могли
+# ещё не получить изменения, поэтому объект читается из основной базы.
+CHANGED = 'object:changed'
+
+
+def object_key(model: type, field: str, value: Any) -> str:
+    return f'object:{model._meta.label_lower}:{field}:{value}'
+
+
+def get(model: type, **lookup) -> Optional[Model]:
+    """Возвращает объект по первичному ключу или уникальному полю.
+
+    Объект хранится в кэше по первичному ключу, а уникальные поля
+    ссылаются на первичный ключ. Поэтому при изменении объекта
+    достаточно пометить ключ по pk, даже если значение уникального
+    поля неизвестно. Отсутствие объекта кэшируется на
+    OBJECT_CACHE_MISSING_TIMEOUT секунд.
+
+    Недавно изменённый объект читается из основной базы и кэшируется
+    только на REPLICA_STICKY_TIMEOUT секунд: запрос мог прочитать его
+    до фиксации чужой записи. Прочитанное из реплики только дополняет
+    кэш и не затирает пометку об изменении, поставленную forget.
+
+    Args:
+        model: Модель.
+        lookup: Одно условие: pk или уникальное поле и его значение.
+
+    Returns:
+        Объект или None, если его нет.
+    """
+    [(field, value)] = lookup.items()
+    key = object_key(model, field, value)
+    pk = value if field == 'pk' else cache.get(key)
+    changed = pk == CHANGED
+    if pk == MISSING:
+        return None
+    if pk is not None and not changed:
+        obj = cache.get(object_key(model, 'pk', pk))
+        if obj == MISSING:
+            return None
+        changed = obj == CHANGED
+        # Уникальное поле могло смениться, а старая ссылка остаться.
+        if (
+            obj is not None
+            and not changed
+            and (field == 'pk' or getattr(obj, field) == value)
+        ):
+            return obj
+    fresh = changed or pinned()
+    with pin_primary(fresh):
+        obj = model._default_manager.filter(**lookup).first()
+    if obj is None:
+        values = {key: MISSING}
+        timeout = settings.OBJECT_CACHE_MISSING_TIMEOUT
+    else:
+        values = {object_key(model, 'pk', obj.pk): obj}
+        if field != 'pk':
+            values[key] = obj.pk
+        timeout = settings.OBJECT_CACHE_TIMEOUT
+    if fresh:
+        cache.set_many(
+            values,
+            min(timeout, settings.REPLICA_STICKY_TIMEOUT),
+        )
+    else:
+        for item in values.items():
+            cache.add(*item, timeout)
+    return obj
+
+
+def get_or_404(model: type, **lookup) -> Model:
+    """Как get, но вместо None вызывает Http404."""
+    obj = get(model, **lookup)
+    if obj is None:
+        raise Http404(
+            f'No {model._meta.object_name} matches the given query.',
+        )
+    return obj
+
+
+def mark_changed(keys: List[str]) -> None:
+    """Помечает ключи изменёнными сейчас и после фиксации транзакции.
+
+    Пока транзакция открыта, другие запросы ещё видят старые данные и
+    могут вернуть их в кэш, поэтому пометка повторяется после COMMIT.
+
+    Args:
+        keys: Ключи кэша.
+    """
+
+    def mark() -> None:
+        cache.set_many(
+            dict.fromkeys(keys, CHANGED),
+            settings.REPLICA_STICKY_TIMEOUT,
+        )
+
+    mark()
+    transaction.on_commit(mark)
+
+
+def forget_pk(model: type, pk: Any) -> None:
+    """Сбрасывает в кэше объект, изменённый в обход save."""
+    mark_changed([object_key(model, 'pk', pk)])
+
+
+def forget(obj: Model) -> None:
+    """Сбрасывает в кэше объект и ссылки на него по уникальным полям.
+
+    Args:
+        obj: Сохранённый или удалённый объект.
+    """
+    model = type(obj)
+    mark_changed(
+        [object_key(model, 'pk', obj.pk)]
+        + [
+            object_key(model, field.attname, getattr(obj, field.attname))
+            for field in obj._meta.concrete_fields
+            if field.unique
+            and not field.primary_key
+            and field.attname in obj.__dict__
+        ],
+    )
@@ -0,0 +1,237 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Следующий номер процесса. Каждый процесс пишет только в свой ключ
+# profile:<номер>, а при чтении ключи сливаются.
+PROCESSES_KEY = 'profile:processes'
+
+# Наименьший номер процесса, ключ которого может быть жив. Ключи
+# процессов, которые давно ничего не записывали, устаревают через
+# PROFILING_RETENTION секунд, и номера до первого живого ключа больше
+# не просматриваются.
+FIRST_KEY = 'profile:processes:first'
+
+# Показатели запроса в порядке хранения в выборке.
+METRICS = ('duration', 'queries', 'sql_time', 'template_time')
+
+local = threading.local()
+
+pending: Dict[str, List[tuple]] = defaultdict(list)
+
+pending_lock = threading.Lock()
+
+flushed = time.monotonic()
+
+flush_lock = threading.Lock()
+
+# Номер процесса и pid, для которого он получен.
+slot: Optional[Tuple[int, int]] = None
+
+
+class Profile:
+    """Показатели одного запроса.
+
+    Экземпляр передаётся в connection.execute_wrapper и считает
+    запросы к базе и время их выполнения.
+    """
+
+    def __init__(self) -> None:
+        self.duration = 0.0
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(
+        self,
+        execute: Callable,
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict,
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += time.perf_counter() - start
+
+    def over_budget(self) -> bool:
+        return (
+            self.queries > settings.PROFILING_MAX_QUERIES
+            or self.duration > settings.PROFILING_MAX_DURATION
+        )
+
+    def sample(self) -> tuple:
+        return tuple(getattr(self, metric) for metric in METRICS)
+
+
+def start() -> Profile:
+    local.profile = Profile()
+    return local.profile
+
+
+def stop() -> None:
+    local.profile = None
+
+
+def current() -> Optional[Profile]:
+    return getattr(local, 'profile', None)
+
+
+@contextmanager
+def template_timer() -> Iterator[None]:
+    """Учитывает время отрисовки шаблона в текущем запросе.
+
+    Вложенные отрисовки, например render_to_string из тега, не
+    учитываются повторно.
+    """
+    profile = current()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    profile.template_depth += 1
+    try:
+        yield
+    finally:
+        profile.template_depth -= 1
+        if not profile.template_depth:
+            profile.template_time += time.perf_counter() - start
+
+
+def record(name: str, profile: Profile) -> None:
+    """Запоминает показатели запроса к представлению.
+
+    Выборки копятся в памяти процесса и раз в
+    PROFILING_FLUSH_INTERVAL секунд переносятся в общий кэш.
+
+    Args:
+        name: Имя URL представления, например posts:index.
+        profile: Показатели запроса.
+    """
+    with pending_lock:
+        pending[name].append(profile.sample())
+    if time.monotonic() - flushed > settings.PROFILING_FLUSH_INTERVAL:
+        flush()
+
+
+def first_and_total() -> Tuple[int, int]:
+    counters = cache.get_many([FIRST_KEY, PROCESSES_KEY])
+    return counters.get(FIRST_KEY, 0), counters.get(PROCESSES_KEY, 0)
+
+
+def process_key() -> str:
+    """Возвращает ключ выборок текущего процесса.
+
+    Номер выдаётся атомарным cache.incr. Если номер процесса больше
+    не просматривается или счётчик пропал из кэша, например после
+    reset, процесс получает новый номер. Счётчик начинается от
+    текущего времени, чтобы не выдать номер, выданный до сброса.
+    """
+    global slot
+    counters = cache.get_many([FIRST_KEY, PROCESSES_KEY])
+    if PROCESSES_KEY not in counters:
+        start = int(time.time() * 1000)
+        if cache.add(PROCESSES_KEY, start, None):
+            cache.set(FIRST_KEY, start, None)
+    elif FIRST_KEY not in counters:
+        cache.add(FIRST_KEY, counters[PROCESSES_KEY], None)
+    first, total = first_and_total()
+    if slot is None or slot[1] != os.getpid() or not first <= slot[0] < total:
+        slot = (cache.incr(PROCESSES_KEY) - 1, os.getpid())
+    return f'profile:{slot[0]}'
+
+
+def flush() -> None:
+    """Переносит накопленные выборки в ключ процесса в общем кэше.
+
+    Ключ живёт PROFILING_RETENTION секунд с последнего переноса,
+    поэтому выборки завершившихся процессов со временем пропадают.
+    """
+    global flushed
+    with pending_lock:
+        batch = dict(pending)
+        pending.clear()
+        flushed = time.monotonic()
+    if not batch:
+        return
+    limit = settings.PROFILING_SAMPLES
+    with flush_lock:
+        key = process_key()
+        samples = cache.get(key, {})
+        for name, new in batch.items():
+            samples[name] = (samples.get(name, []) + new)[-limit:]
+        cache.set(key, samples, settings.PROFILING_RETENTION)
+
+
+def process_keys() -> List[str]:
+    first, total = first_and_total()
+    return [f'profile:{number}' for number in range(first, total)]
+
+
+def collect() -> Dict[str, List[tuple]]:
+    """Сливает выборки всех процессов по именам URL.
+
+    Устаревшие ключи пропускаются, а номера до первого живого ключа
+    больше не просматриваются.
+    """
+    result = defaultdict(list)
+    found = cache.get_many(process_keys())
+    for samples in found.values():
+        for name, values in samples.items():
+            result[name].extend(values)
+    if found:
+        cache.set(
+            FIRST_KEY,
+            min(int(key.rsplit(':', 1)[1]) for key in found),
+            None,
+        )
+    return result
+
+
+def percentile(values: List[float], percent: int) -> float:
+    """Возвращает перцентиль по методу ближайшего ранга.
+
+    Args:
+        values: Отсортированные значения.
+        percent: Перцентиль от 0 до 100.
+
+    Returns:
+        Значение перцентиля.
+    """
+    return values[max(math.ceil(len(values) * percent / 100) - 1, 0)]
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Собирает перцентили показателей по именам URL.
+
+    Returns:
+        Словарь {имя URL: {'count': n, показатель: {перцентиль: значение}}}.
+    """
+    result = {}
+    for name, samples in sorted(collect().items()):
+        result[name] = {'count': len(samples)}
+        for index, metric in enumerate(METRICS):
+            values = sorted(sample[index] for sample in samples)
+            result[name][metric] = {
+                percent: percentile(values, percent)
+                for percent in settings.PROFILING_PERCENTILES
+            }
+    return result
+
+
+def reset() -> None:
+    cache.delete_many(process_keys() + [FIRST_KEY, PROCESSES_KEY])
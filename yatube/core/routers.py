@@ -0,0 +1,77 @@
+import random
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest
+
+local = threading.local()
+
+
+def pinned() -> bool:
+    return getattr(local, 'pinned', False)
+
+
+def mark_written(request: HttpRequest) -> None:
+    """Отмечает, что запрос изменил данные, хотя его метод безопасный.
+
+    PrimaryPinMiddleware после такого запроса тоже направляет чтение
+    пользователя в основную базу, например после подписки по ссылке.
+
+    Args:
+        request: Объект запроса.
+    """
+    request.primary_written = True
+
+
+@contextmanager
+def pin_primary(pin: bool = True) -> Iterator[None]:
+    """Направляет чтение внутри блока в основную базу.
+
+    Args:
+        pin: Включить ли привязку; False оставляет всё как есть.
+    """
+    previous = pinned()
+    local.pinned = previous or pin
+    try:
+        yield
+    finally:
+        local.pinned = previous
+
+
+class ReplicaRouter:
+    """Отправляет запись в основную базу, а чтение — в реплики из
+    DATABASE_REPLICAS.
+
+    Чтение остаётся в основной базе внутри транзакции и после
+    pin_primary, например сразу после того, как пользователь что-то
+    изменил.
+    """
+
+    def db_for_read(self, model: type, **hints) -> str:
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            not replicas
+            or pinned()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model: type, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: object, obj2: object, **hints) -> bool:
+        return True
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        model_name: Optional[str] = None,
+        **hints,
+    ) -> bool:
+        # Реплики получают схему вместе с данными из основной базы.
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_out
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.backends import forget_user
+from core.models import User
+
+
+@receiver(connection_created)
+def tune_sqlite(
+    sender: type,
+    connection: BaseDatabaseWrapper,
+    **kwargs,
+) -> None:
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender: type, instance: User, **kwargs) -> None:
+    forget_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(
+    sender: type,
+    user: Optional[User],
+    **kwargs,
+) -> None:
+    if user is not None:
+        forget_user(user.pk)
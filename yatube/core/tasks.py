@@ -0,0 +1,299 @@
+import base64
+import json
+import logging
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import Batch, Task, User
+from core.routers import pin_primary
+
+logger = logging.getLogger(__name__)
+
+registry: Dict[str, Callable] = {}
+
+
+def task(function: Callable) -> Callable:
+    """Регистрирует функцию как фоновую задачу.
+
+    У функции появляются метод delay, который ставит вызов в очередь,
+    и имя задачи task_name. Аргументы вызова должны сериализоваться
+    в JSON; аргумент run_at задаёт время запуска и задаче не
+    передаётся.
+
+    Args:
+        function: Функция задачи.
+
+    Returns:
+        Та же функция с методом delay.
+    """
+    name = f'{function.__module__}.{function.__name__}'
+    registry[name] = function
+
+    def delay(*args, **kwargs) -> None:
+        enqueue(name, *args, **kwargs)
+
+    function.delay = delay
+    function.task_name = name
+    return function
+
+
+def enqueue(
+    name: str,
+    *args,
+    run_at: Optional[datetime] = None,
+    **kwargs,
+) -> None:
+    """Ставит задачу в очередь.
+
+    Задача записывается в базу в текущей транзакции, поэтому
+    обработчик увидит её только после фиксации. При
+    TASKS_ALWAYS_EAGER задача выполняется сразу.
+
+    Args:
+        name: Имя зарегистрированной задачи.
+        run_at: Время, раньше которого задачу не выполнять; по
+            умолчанию — сразу.
+    """
+    if settings.TASKS_ALWAYS_EAGER:
+        registry[name](*args, **kwargs)
+        return
+    Task.objects.create(
+        name=name,
+        payload=json.dumps({'args': args, 'kwargs': kwargs}),
+        run_at=run_at or timezone.now(),
+    )
+
+
+def claim(limit: int) -> List[Task]:
+    """Забирает из очереди задачи, готовые к выполнению.
+
+    Задачи, которые выполняются дольше TASKS_VISIBILITY_TIMEOUT,
+    считаются брошенными и возвращаются в очередь.
+
+    Args:
+        limit: Максимальное число задач.
+
+    Returns:
+        Список задач со статусом «выполняется».
+    """
+    now = timezone.now()
+    Task.objects.filter(
+        status=Task.RUNNING,
+        started__lt=now - timedelta(seconds=settings.TASKS_VISIBILITY_TIMEOUT),
+    ).update(status=Task.PENDING)
+    claimed = [
+        pk
+        for pk in Task.objects.filter(status=Task.PENDING, run_at__lte=now)
+        .order_by('run_at')
+        .values_list('pk', flat=True)[:limit]
+        if Task.objects.filter(pk=pk, status=Task.PENDING).update(
+            status=Task.RUNNING,
+            started=now,
+            attempts=F('attempts') + 1,
+        )
+    ]
+    return list(Task.objects.filter(pk__in=claimed))
+
+
+def execute(job: Task) -> None:
+    """Выполняет задачу и записывает результат.
+
+    После неудачной попытки задача возвращается в очередь с
+    экспоненциальной задержкой, пока не исчерпано TASKS_MAX_ATTEMPTS.
+
+    Args:
+        job: Задача, полученная из claim.
+    """
+    try:
+        payload = json.loads(job.payload)
+        # Задача могла быть поставлена сразу после записи, которая
+        # ещё не дошла до реплик.
+        with pin_primary():
+            registry[job.name](*payload['args'], **payload['kwargs'])
+    except Exception:
+        logger.exception('Фоновая задача %s завершилась ошибкой', job)
+        retry = job.attempts < settings.TASKS_MAX_ATTEMPTS
+        Task.objects.filter(pk=job.pk).update(
+            status=Task.PENDING if retry else Task.FAILED,
+            run_at=timezone.now()
+            + timedelta(
+                seconds=settings.TASKS_RETRY_DELAY * 2 ** (job.attempts - 1),
+            ),
+            last_error=traceback.format_exc(),
+        )
+    else:
+        Task.objects.filter(pk=job.pk).update(status=Task.DONE)
+
+
+def run_pending(limit: int = settings.TASKS_WORKERS) -> int:
+    """Выполняет готовые задачи в текущем потоке.
+
+    Args:
+        limit: Максимальное число задач.
+
+    Returns:
+        Число выполненных задач.
+    """
+    jobs = claim(limit)
+    for job in jobs:
+        execute(job)
+    return len(jobs)
+
+
+def prune() -> None:
+    """Удаляет выполненные задачи старше TASKS_KEEP_DONE."""
+    Task.objects.filter(
+        status=Task.DONE,
+        started__lt=timezone.now()
+        - timedelta(seconds=settings.TASKS_KEEP_DONE),
+    ).delete()
+
+
+def start_batch(
+    action: Callable,
+    ids: List[int],
+    description: str,
+    user: Optional[User] = None,
+    **options,
+) -> Batch:
+    """Запускает пакетную операцию над объектами в фоне.
+
+    Args:
+        action: Задача, которая обрабатывает одну порцию id.
+        ids: id объектов.
+        description: Описание операции для администратора.
+        user: Пользователь, запустивший операцию.
+        options: Дополнительные аргументы задачи порции.
+
+    Returns:
+        Созданная операция.
+    """
+    batch = Batch.objects.create(
+        action=action.task_name,
+        description=description,
+        ids=json.dumps(ids),
+        options=json.dumps(options),
+        total=len(ids),
+        user=user,
+    )
+    run_batch.delay(batch.pk)
+    return batch
+
+
+@task
+def run_batch(batch_id: int) -> None:
+    """Выполняет очередную порцию пакетной операции.
+
+    Порция из ADMIN_BATCH_SIZE объектов фиксируется отдельной
+    транзакцией вместе с числом обработанных объектов, а следующая
+    ставится в очередь через ADMIN_BATCH_PAUSE секунд. Поэтому одно
+    выполнение задачи не переживает TASKS_VISIBILITY_TIMEOUT, между
+    порциями база открыта для других записей, а после сбоя операция
+    продолжается с первой необработанной порции.
+
+    Args:
+        batch_id: id операции.
+    """
+    batch = Batch.objects.get(pk=batch_id)
+    if batch.done < batch.total:
+        start = batch.done
+        end = min(start + settings.ADMIN_BATCH_SIZE, batch.total)
+        with transaction.atomic():
+            # Порцию уже обработал другой запуск той же операции.
+            if not Batch.objects.filter(pk=batch.pk, done=start).update(
+                done=end,
+            ):
+                return
+            registry[batch.action](
+                json.loads(batch.ids)[start:end],
+                **json.loads(batch.options),
+            )
+        if end < batch.total:
+            run_batch.delay(
+                batch.pk,
+                run_at=timezone.now()
+                + timedelta(seconds=settings.ADMIN_BATCH_PAUSE),
+            )
+            return
+    Batch.objects.filter(pk=batch.pk).update(finished=timezone.now())
+
+
+@task
+def send_email(messages: List[dict]) -> None:
+    """Отправляет письма через TASKS_EMAIL_BACKEND.
+
+    Args:
+        messages: Поля писем, полученные из serialize_messages.
+    """
+    get_connection(settings.TASKS_EMAIL_BACKEND).send_messages(
+        [deserialize_message(fields) for fields in messages],
+    )
+
+
+def serialize_messages(messages: list) -> List[dict]:
+    """Записывает поля писем в словари, которые сериализуются в JSON.
+
+    Двоичные вложения кодируются в base64.
+
+    Args:
+        messages: Письма.
+
+    Returns:
+        Список словарей с полями писем.
+    """
+    return [
+        {
+            'subject': message.subject,
+            'body': message.body,
+            'from_email': message.from_email,
+            'to': message.to,
+            'cc': message.cc,
+            'bcc': message.bcc,
+            'reply_to': message.reply_to,
+            'headers': message.extra_headers,
+            'content_subtype': message.content_subtype,
+            'alternatives': getattr(message, 'alternatives', []),
+            'attachments': [
+                (
+                    filename,
+                    base64.b64encode(content).decode()
+                    if isinstance(content, bytes)
+                    else content,
+                    mimetype,
+                    isinstance(content, bytes),
+                )
+                for filename, content, mimetype in message.attachments
+            ],
+        }
+        for message in messages
+    ]
+
+
+def deserialize_message(fields: dict) -> EmailMultiAlternatives:
+    """Собирает письмо из словаря, записанного serialize_messages."""
+    message = EmailMultiAlternatives(
+        subject=fields['subject'],
+        body=fields['body'],
+        from_email=fields['from_email'],
+        to=fields['to'],
+        cc=fields['cc'],
+        bcc=fields['bcc'],
+        reply_to=fields['reply_to'],
+        headers=fields['headers'],
+        alternatives=[tuple(item) for item in fields['alternatives']],
+    )
+    message.content_subtype = fields['content_subtype']
+    for filename, content, mimetype, binary in fields['attachments']:
+        message.attach(
+            filename,
+            base64.b64decode(content) if binary else content,
+            mimetype,
+        )
+    return message
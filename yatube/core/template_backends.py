@@ -0,0 +1,32 @@
+from typing import Optional
+
+from django.http import HttpRequest
+from django.template import TemplateDoesNotExist
+from django.template.backends import django
+
+from core import profiling
+
+
+class Template(django.Template):
+    def render(
+        self,
+        context: Optional[dict] = None,
+        request: Optional[HttpRequest] = None,
+    ) -> str:
+        with profiling.template_timer():
+            return super().render(context, request)
+
+
+class ProfilingTemplates(django.DjangoTemplates):
+    """Шаблоны Django, время отрисовки которых учитывает
+    ProfilingMiddleware.
+    """
+
+    def from_string(self, template_code: str) -> Template:
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> Template:
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django.reraise(exc, self)
@@ -0,0 +1,14 @@
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+
+@register.simple_tag
+def cache_timeout() -> int:
+    """Возвращает время жизни кэша для тега {% cache %}.
+
+    Returns:
+        CACHE_TIMEOUT из настроек проекта.
+    """
+    return settings.CACHE_TIMEOUT
@@ -0,0 +1,32 @@
+from django import template
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeText, mark_safe
+
+from core.cache import punch_hole
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def personal(
+    context: template.Context,
+    template_name: str,
+    **params,
+) -> SafeText:
+    """Выводит фрагмент страницы, который зависит от пользователя.
+
+    На страницах, общих для всех пользователей (cache_page_on), вместо
+    фрагмента выводится метка, которую заменяет cache_page_on.
+
+    Args:
+        context: Контекст шаблона.
+        template_name: Шаблон фрагмента.
+        params: Контекст фрагмента.
+
+    Returns:
+        Фрагмент или метка.
+    """
+    request = context.get('request')
+    if getattr(request, 'punch_holes', False):
+        return mark_safe(punch_hole(template_name, params))
+    return render_to_string(template_name, params, request)
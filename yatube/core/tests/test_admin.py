@@ -0,0 +1,37 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from mixer.backend.django import mixer
+
+from core.admin import BatchAdmin, EstimatedCountPaginator
+from core.models import Batch
+
+User = get_user_model()
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @override_settings(ADMIN_COUNT_LIMIT=3)
+    def test_count_limit(self) -> None:
+        """Строки считаются не дальше ADMIN_COUNT_LIMIT."""
+        mixer.cycle(5).blend(User)
+        users = User.objects.filter(pk__gt=0).order_by('pk')
+        self.assertEqual(EstimatedCountPaginator(users, 2).count, 3)
+
+    @override_settings(ADMIN_COUNT_LIMIT=3)
+    def test_estimate(self) -> None:
+        """Без фильтров число строк берётся из статистики."""
+        mixer.cycle(5).blend(User)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.assertEqual(
+            EstimatedCountPaginator(User.objects.order_by('pk'), 2).count,
+            5,
+        )
+
+
+class BatchAdminTests(TestCase):
+    def test_empty_batch_progress(self) -> None:
+        """Прогресс пустой порции не делит на ноль."""
+        batch = Batch(action='posts.delete_posts', ids='[]', total=0)
+        self.assertEqual(BatchAdmin(Batch, admin.site).progress(batch), '0%')
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core.backends import user_key
+
+User = get_user_model()
+
+
+class CachedModelBackendTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = mixer.blend(User)
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('about:author')
+
+    def test_warm_request_without_queries(self) -> None:
+        """Сессия и пользователь берутся из кэша без запросов к базе."""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_user_update_invalidates(self) -> None:
+        """После смены пароля сессия пользователя завершается."""
+        self.client.get(self.url)
+        self.user.set_password('new password')
+        self.user.save()
+        self.assertIsNone(cache.get(user_key(self.user.pk)))
+        response = self.client.get(self.url)
+        self.assertFalse(response.context['user'].is_authenticated)
+
+    def test_logout_invalidates(self) -> None:
+        """Выход удаляет пользователя из кэша."""
+        self.client.get(self.url)
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(cache.get(user_key(self.user.pk)))
@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.cache import (
+    bump_generation,
+    fill_holes,
+    get_generation,
+    punch_hole,
+    single_flight,
+)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_value_computed_once(self) -> None:
+        """Закэшированное значение не пересчитывается."""
+        compute = mock.Mock(return_value='page')
+        for _ in range(3):
+            self.assertEqual(single_flight('key', 'stale', compute), 'page')
+        compute.assert_called_once()
+
+    def test_stale_value_served_while_locked(self) -> None:
+        """Пока идёт пересчёт, остальные получают прошлое значение."""
+        cache.set('stale', 'old page')
+        cache.add('key:lock', True)
+        compute = mock.Mock(return_value='page')
+        self.assertEqual(single_flight('key', 'stale', compute), 'old page')
+        compute.assert_not_called()
+
+    @override_settings(CACHE_LOCK_TIMEOUT=0)
+    def test_compute_after_lock_timeout(self) -> None:
+        """Без прошлого значения пересчёт выполняется после ожидания."""
+        cache.add('key:lock', True)
+        compute = mock.Mock(return_value='page')
+        self.assertEqual(single_flight('key', 'stale', compute), 'page')
+        self.assertEqual(cache.get('stale'), 'page')
+
+    def test_bump_generation(self) -> None:
+        """Смена поколения меняет его номер."""
+        generation = get_generation('index_page')
+        bump_generation('index_page')
+        self.assertEqual(get_generation('index_page'), generation + 1)
+
+
+class HoleTests(SimpleTestCase):
+    @mock.patch('core.cache.render_to_string', return_value='<b>ok</b>')
+    def test_only_signed_holes_rendered(self, render) -> None:
+        """Отрисовываются только метки с верной подписью."""
+        request = RequestFactory().get('/')
+        hole = punch_hole('includes/header.html', {}).encode()
+        forged = b'<!--hole:WyJpbmNsdWRlcy9oZWFkZXIuaHRtbCIsIHt9XQ==-->'
+        tampered = hole.replace(b':', b':x', 1)
+        self.assertEqual(fill_holes(hole, request), b'<b>ok</b>')
+        self.assertEqual(fill_holes(forged + tampered, request), b'')
+        render.assert_called_once_with('includes/header.html', {}, request)
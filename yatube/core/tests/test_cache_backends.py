@@ -0,0 +1,84 @@
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from core.cache_backends import SQLiteCache
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = str(Path(directory.name) / 'cache.sqlite3')
+
+    def get_cache(self, **options) -> SQLiteCache:
+        return SQLiteCache(self.path, {'OPTIONS': options})
+
+    def test_cache_shared_between_instances(self) -> None:
+        """Значение, записанное одним процессом, видно другому."""
+        self.get_cache().set('key', {'page': 1})
+        other = self.get_cache()
+        self.assertEqual(other.get('key'), {'page': 1})
+        self.assertFalse(other.add('key', 'other'))
+        other.set('counter', 1)
+        self.assertEqual(self.get_cache().incr('counter'), 2)
+        other.delete('key')
+        self.assertIsNone(self.get_cache().get('key'))
+
+    def test_expired_value_replaced_by_add(self) -> None:
+        """Просроченное значение не возвращается и заменяется add."""
+        cache = self.get_cache()
+        cache.set('key', 'old', 0)
+        self.assertIsNone(cache.get('key'))
+        self.assertTrue(cache.add('key', 'new'))
+        self.assertEqual(cache.get('key'), 'new')
+
+    def test_least_recently_used_evicted(self) -> None:
+        """При превышении MAX_ENTRIES вытесняются давно не читанные."""
+        cache = self.get_cache(MAX_ENTRIES=3, CULL_FREQUENCY=2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key)
+        cache._connection.execute(
+            "UPDATE cache SET accessed = 0 WHERE key LIKE '%:b'",
+        )
+        cache.set('d', 'd')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('d'), 'd')
+
+    def test_size_limit(self) -> None:
+        """Объём кэша не превышает MAX_SIZE."""
+        cache = self.get_cache(MAX_SIZE=10000)
+        for number in range(20):
+            cache.set(number, 'x' * 1000)
+        size = cache._connection.execute(
+            'SELECT TOTAL(size) FROM cache',
+        ).fetchone()[0]
+        self.assertLessEqual(size, 10000)
+        self.assertIsNotNone(cache.get(19))
+
+    def test_totals_kept_without_scans(self) -> None:
+        """Число и объём записей хранятся отдельно и не расходятся."""
+        cache = self.get_cache(MAX_ENTRIES=5)
+        for number in range(8):
+            cache.set(number, 'x' * number)
+        cache.set(1, 'longer value')
+        cache.set('counter', 1)
+        cache.incr('counter', 1000)
+        cache.delete(2)
+        connection = cache._connection
+        self.assertEqual(
+            connection.execute(
+                'SELECT count, size FROM cache_stats',
+            ).fetchone(),
+            connection.execute(
+                'SELECT COUNT(*), TOTAL(size) FROM cache',
+            ).fetchone(),
+        )
+        cache.clear()
+        self.assertEqual(
+            connection.execute(
+                'SELECT count, size FROM cache_stats',
+            ).fetchone(),
+            (0, 0),
+        )
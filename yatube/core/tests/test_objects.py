@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+from django.test import TestCase, TransactionTestCase, override_settings
+from mixer.backend.django import mixer
+
+from core import objects
+
+User = get_user_model()
+
+
+class ObjectCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = mixer.blend(User)
+
+    def test_hit_without_queries(self) -> None:
+        """Повторный поиск по ключу не обращается к базе."""
+        objects.get(User, username=self.user.username)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                objects.get(User, username=self.user.username),
+                self.user,
+            )
+            self.assertEqual(objects.get(User, pk=self.user.pk), self.user)
+
+    def test_missing_cached(self) -> None:
+        """Отсутствие объекта кэшируется."""
+        self.assertIsNone(objects.get(User, username='nobody'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(objects.get(User, username='nobody'))
+            with self.assertRaises(Http404):
+                objects.get_or_404(User, username='nobody')
+
+    def test_create_replaces_missing(self) -> None:
+        """Созданный объект находится сразу после создания."""
+        objects.get(User, username='newcomer')
+        user = mixer.blend(User, username='newcomer')
+        self.assertEqual(objects.get(User, username='newcomer'), user)
+
+    def test_rename_invalidates(self) -> None:
+        """После смены уникального поля старое значение не находится."""
+        old = self.user.username
+        objects.get(User, username=old)
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertIsNone(objects.get(User, username=old))
+        self.assertEqual(
+            objects.get(User, username='renamed').username,
+            'renamed',
+        )
+
+    def test_delete_invalidates(self) -> None:
+        """Удалённый объект пропадает из кэша."""
+        pk = self.user.pk
+        objects.get(User, pk=pk)
+        self.user.delete()
+        self.assertIsNone(objects.get(User, pk=pk))
+
+    def test_stale_fill_after_change_ignored(self) -> None:
+        """Чтение из отставшей реплики не затирает пометку об изменении."""
+        key = objects.object_key(User, 'pk', self.user.pk)
+        objects.get(User, pk=self.user.pk)
+        self.user.first_name = 'Новое'
+        self.user.save()
+        self.assertFalse(cache.add(key, 'stale'))
+        user = objects.get(User, pk=self.user.pk)
+        self.assertEqual(user.first_name, 'Новое')
+        with self.assertNumQueries(0):
+            objects.get(User, pk=self.user.pk)
+
+    @override_settings(REPLICA_STICKY_TIMEOUT=1)
+    def test_refill_after_change_short_lived(self) -> None:
+        """Объект, перечитанный после изменения, кэшируется ненадолго."""
+        self.user.save()
+        with mock.patch('core.objects.cache.set_many') as set_many:
+            objects.get(User, pk=self.user.pk)
+        set_many.assert_called_once_with(mock.ANY, 1)
+
+
+class ObjectCacheCommitTests(TransactionTestCase):
+    def test_forget_after_commit(self) -> None:
+        """Объект, закэшированный до фиксации изменений, сбрасывается."""
+        cache.clear()
+        user = mixer.blend(User)
+        key = objects.object_key(User, 'pk', user.pk)
+        with transaction.atomic():
+            user.save()
+            # Другой запрос кэширует версию до фиксации транзакции.
+            cache.set(key, 'stale')
+        self.assertEqual(cache.get(key), objects.CHANGED)
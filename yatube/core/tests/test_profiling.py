@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import profiling
+
+
+@override_settings(PROFILING_FLUSH_INTERVAL=0)
+class ProfilingTests(TestCase):
+    def setUp(self) -> None:
+        profiling.flush()
+        cache.clear()
+
+    def test_stats_collected(self) -> None:
+        """Показатели запроса попадают в статистику по имени URL."""
+        self.client.get(reverse('posts:index'))
+        stats = profiling.stats()['posts:index']
+        self.assertEqual(stats['count'], 1)
+        self.assertGreater(stats['queries'][50], 0)
+        self.assertGreater(stats['template_time'][50], 0)
+        self.assertGreaterEqual(
+            stats['duration'][50],
+            stats['sql_time'][50] + stats['template_time'][50],
+        )
+
+    def test_processes_do_not_overwrite_samples(self) -> None:
+        """Выборки разных процессов не затирают друг друга."""
+        self.client.get(reverse('posts:index'))
+        # Следующий сброс выполняется как из другого процесса.
+        profiling.slot = None
+        self.client.get(reverse('posts:index'))
+        self.assertEqual(len(profiling.process_keys()), 2)
+        self.assertEqual(profiling.stats()['posts:index']['count'], 2)
+
+    def test_expired_processes_skipped(self) -> None:
+        """Устаревшие выборки процессов не учитываются и не просматриваются."""
+        self.client.get(reverse('posts:index'))
+        [expired] = profiling.process_keys()
+        profiling.slot = None
+        self.client.get(reverse('posts:index'))
+        cache.delete(expired)
+        self.assertEqual(profiling.stats()['posts:index']['count'], 1)
+        self.assertNotIn(expired, profiling.process_keys())
+        self.assertEqual(len(profiling.process_keys()), 1)
+
+    @override_settings(PROFILING_MAX_QUERIES=0)
+    def test_over_budget_logged(self) -> None:
+        """Запрос сверх бюджета записывается в журнал."""
+        with self.assertLogs('core.profiling', 'WARNING') as logs:
+            self.client.get(reverse('posts:index'))
+        self.assertIn('posts:index', logs.output[0])
+
+    def test_profile_stats_command(self) -> None:
+        """Команда profile_stats выводит перцентили и сбрасывает их."""
+        self.client.get(reverse('posts:index'))
+        out = StringIO()
+        call_command('profile_stats', stdout=out)
+        self.assertIn('posts:index', out.getvalue())
+        call_command('profile_stats', '--reset', stdout=StringIO())
+        self.assertEqual(profiling.stats(), {})
@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.test import (
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core.cache import bump_generation, cache_page_on
+from core.middleware import PrimaryPinMiddleware
+from core.routers import ReplicaRouter, pin_primary
+from posts.models import Follow, Post, User
+
+
+def read_db(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(ReplicaRouter().db_for_read(Post))
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_TIMEOUT=5)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.middleware = PrimaryPinMiddleware(read_db)
+
+    def test_reads_go_to_replica(self) -> None:
+        """Чтение идёт в реплику, запись и закреплённое чтение — в основную."""
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Post), 'replica1')
+        self.assertEqual(router.db_for_write(Post), 'default')
+        with pin_primary():
+            self.assertEqual(router.db_for_read(Post), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self) -> None:
+        """Без реплик всё читается из основной базы."""
+        self.assertEqual(ReplicaRouter().db_for_read(Post), 'default')
+
+    def test_read_your_writes(self) -> None:
+        """После изменения данных пользователь читает из основной базы."""
+        self.assertEqual(
+            self.middleware(self.factory.get('/')).content,
+            b'replica1',
+        )
+        response = self.middleware(self.factory.post('/'))
+        self.assertEqual(response.content, b'default')
+        cookie = response.cookies['use_primary']
+        self.assertEqual(cookie['max-age'], 5)
+        request = self.factory.get('/')
+        request.COOKIES['use_primary'] = cookie.value
+        self.assertEqual(self.middleware(request).content, b'default')
+
+    def test_cache_fill_after_change_reads_primary(self) -> None:
+        """После изменения страница для кэша строится по основной базе."""
+        cache.clear()
+        databases = []
+
+        @cache_page_on('index_page')
+        def view(request: HttpRequest) -> HttpResponse:
+            databases.append(ReplicaRouter().db_for_read(Post))
+            return HttpResponse()
+
+        view(self.factory.get('/first/'))
+        bump_generation('index_page')
+        view(self.factory.get('/second/'))
+        self.assertEqual(databases, ['replica1', 'default'])
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_TIMEOUT=5)
+class FollowPinTests(TestCase):
+    def test_follow_pins_primary(self) -> None:
+        """После подписки и отписки по ссылке чтение идёт в основную базу."""
+        user, author = mixer.cycle(2).blend(User)
+        client = Client()
+        client.force_login(user)
+        for view in ('profile_follow', 'profile_unfollow'):
+            with self.subTest(view=view):
+                response = client.get(
+                    reverse(f'posts:{view}', args=(author.username,)),
+                )
+                self.assertIn('use_primary', response.cookies)
+        self.assertFalse(Follow.objects.exists())
@@ -0,0 +1,12 @@
+from django.db import connection
+from django.test import TestCase
+
+
+class SQLiteTuningTests(TestCase):
+    def test_pragmas_applied(self) -> None:
+        """Новое соединение с SQLite получает настройки SQLITE_PRAGMAS."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
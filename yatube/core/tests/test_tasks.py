@@ -0,0 +1,142 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.models import Batch, Task
+from core.tasks import run_batch, run_pending, start_batch, task
+
+calls = mock.Mock()
+
+
+@task
+def record(value: int) -> None:
+    calls(value)
+
+
+@task
+def record_chunk(ids: list, step: int) -> None:
+    calls([pk * step for pk in ids])
+
+
+@task
+def fail() -> None:
+    raise RuntimeError('ошибка')
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class TasksTests(TestCase):
+    def setUp(self) -> None:
+        calls.reset_mock()
+
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_task_runs_immediately(self) -> None:
+        """В синхронном режиме задача выполняется без очереди."""
+        record.delay(1)
+        calls.assert_called_once_with(1)
+        self.assertFalse(Task.objects.exists())
+
+    def test_task_queued_and_executed(self) -> None:
+        """Задача попадает в очередь и выполняется обработчиком."""
+        record.delay(2)
+        calls.assert_not_called()
+        self.assertEqual(run_pending(), 1)
+        calls.assert_called_once_with(2)
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+
+    def test_failed_task_retried(self) -> None:
+        """Упавшая задача откладывается, а после всех попыток — ошибка."""
+        fail.delay()
+        self.assertEqual(run_pending(), 1)
+        job = Task.objects.get()
+        self.assertEqual(job.status, Task.PENDING)
+        self.assertIn('RuntimeError', job.last_error)
+        self.assertEqual(run_pending(), 0)
+        with self.settings(TASKS_MAX_ATTEMPTS=2):
+            Task.objects.update(run_at=job.created)
+            run_pending()
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_email_sent_from_task(self) -> None:
+        """Письма отправляются обработчиком очереди."""
+        backend = 'django.core.mail.backends.locmem.EmailBackend'
+        with self.settings(
+            EMAIL_BACKEND='core.mail.TaskEmailBackend',
+            TASKS_EMAIL_BACKEND=backend,
+        ):
+            mail.send_mail('Тема', 'Текст', None, ('user@example.com',))
+            self.assertEqual(len(mail.outbox), 0)
+            run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_email_payload_is_json(self) -> None:
+        """Письмо хранится в очереди как JSON и собирается обработчиком."""
+        backend = 'django.core.mail.backends.locmem.EmailBackend'
+        message = mail.EmailMultiAlternatives(
+            'Тема',
+            'Текст',
+            'site@example.com',
+            ('user@example.com',),
+        )
+        message.attach_alternative('<p>Текст</p>', 'text/html')
+        message.attach('file.bin', b'\x00\x01', 'application/octet-stream')
+        with self.settings(
+            EMAIL_BACKEND='core.mail.TaskEmailBackend',
+            TASKS_EMAIL_BACKEND=backend,
+        ):
+            message.send()
+            json.loads(Task.objects.get().payload)
+            run_pending()
+        [sent] = mail.outbox
+        self.assertEqual(sent.subject, 'Тема')
+        self.assertEqual(sent.to, ['user@example.com'])
+        self.assertEqual(sent.alternatives, [('<p>Текст</p>', 'text/html')])
+        self.assertEqual(
+            sent.attachments,
+            [('file.bin', b'\x00\x01', 'application/octet-stream')],
+        )
+
+    def test_runworker_once(self) -> None:
+        """Команда runworker --once выполняет задачи и завершается."""
+        record.delay(3)
+        call_command('runworker', '--once', '--workers=1', stdout=StringIO())
+        calls.assert_called_once_with(3)
+
+    @override_settings(ADMIN_BATCH_SIZE=2, ADMIN_BATCH_PAUSE=0)
+    def test_batch_runs_in_chunks(self) -> None:
+        """Пакетная операция обрабатывает объекты порциями."""
+        batch = start_batch(record_chunk, [1, 2, 3], 'Проверка', step=10)
+        calls.assert_not_called()
+        # Каждое выполнение задачи обрабатывает одну порцию.
+        self.assertEqual(run_pending(), 1)
+        calls.assert_called_once_with([10, 20])
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(
+            calls.call_args_list,
+            [mock.call([10, 20]), mock.call([30])],
+        )
+        batch.refresh_from_db()
+        self.assertEqual(batch.done, 3)
+        self.assertIsNotNone(batch.finished)
+
+    @override_settings(ADMIN_BATCH_SIZE=2, ADMIN_BATCH_PAUSE=0)
+    def test_batch_resumes(self) -> None:
+        """Повторный запуск продолжает с необработанной порции."""
+        batch = start_batch(record_chunk, [1, 2, 3], 'Проверка', step=1)
+        Batch.objects.filter(pk=batch.pk).update(done=2)
+        run_batch(batch.pk)
+        calls.assert_called_once_with([3])
+        batch.refresh_from_db()
+        self.assertIsNotNone(batch.finished)
+
+    @override_settings(ADMIN_BATCH_SIZE=2, ADMIN_BATCH_PAUSE=60)
+    def test_batch_pause(self) -> None:
+        """Следующая порция ставится в очередь через паузу."""
+        start_batch(record_chunk, [1, 2, 3], 'Проверка', step=1)
+        run_pending()
+        self.assertEqual(run_pending(), 0)
+        calls.assert_called_once_with([1, 2])
@@ -1,13 +1,161 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Any, List, Optional, Sequence, Tuple
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.paginator import Page, Paginator
+from django.db.models import Q
 from django.db.models.query import QuerySet
 from django.http import HttpRequest
 
+AFTER = 'a'
+BEFORE = 'b'
+
+
+class KeysetPage(Page):
+    """Страница, полученная по курсору, без номера и общего количества."""
+
+    def __init__(
+        self,
+        object_list: Sequence,
+        paginator: 'KeysetPaginator',
+        next_cursor: Optional[str],
+        previous_cursor: Optional[str],
+    ) -> None:
+        super().__init__(object_list, 1, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self) -> str:
+        return '<Keyset page>'
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator(Paginator):
+    """Разбивает QuerySet на страницы по курсору вместо OFFSET.
+
+    Курсор хранит значения полей сортировки последнего элемента
+    страницы, поэтому каждая страница — один запрос по индексу,
+    без COUNT(*). Сортировка берётся из QuerySet или Meta.ordering
+    модели и дополняется первичным ключом.
+    """
+
+    keyset = True
+
+    def __init__(self, object_list: QuerySet, per_page: int) -> None:
+        super().__init__(object_list, per_page)
+        ordering = list(
+            object_list.query.order_by or object_list.model._meta.ordering,
+        )
+        if ordering[-1].lstrip('-') not in ('pk', 'id'):
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        self.ordering = ordering
+
+    def get_page(self, cursor: Optional[str]) -> KeysetPage:
+        """Возвращает страницу, на которую указывает курсор.
+
+        Неверный курсор ведёт на первую страницу.
+
+        Args:
+            cursor: Курсор из ссылки на соседнюю страницу.
+
+        Returns:
+            Объект KeysetPage.
+        """
+        direction, values = self.decode(cursor)
+        ordering = self.ordering
+        if direction == BEFORE:
+            ordering = [self.invert(field) for field in ordering]
+        queryset = self.object_list.order_by(*ordering)
+        if values:
+            queryset = queryset.filter(self.seek(ordering, values))
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if direction == BEFORE:
+            rows.reverse()
+        has_next = has_more if direction != BEFORE else True
+        has_previous = has_more if direction == BEFORE else bool(values)
+        return KeysetPage(
+            rows,
+            self,
+            self.encode(AFTER, rows[-1]) if rows and has_next else None,
+            self.encode(BEFORE, rows[0]) if rows and has_previous else None,
+        )
+
+    def encode(self, direction: str, row: Any) -> str:
+        """Записывает в курсор значения полей сортировки элемента."""
+        values = [
+            row[name] if isinstance(row, dict) else getattr(row, name)
+            for name in self.names
+        ]
+        data = json.dumps([direction, values], default=str)
+        return urlsafe_b64encode(data.encode()).decode()
+
+    def decode(self, cursor: Optional[str]) -> Tuple[str, Optional[list]]:
+        """Читает из курсора направление и значения полей сортировки."""
+        if not cursor:
+            return AFTER, None
+        try:
+            direction, values = json.loads(urlsafe_b64decode(cursor))
+            values = [
+                self.field(name).to_python(value)
+                for name, value in zip(self.names, values)
+            ]
+        except (binascii.Error, ValidationError, ValueError, TypeError):
+            return AFTER, None
+        if direction not in (AFTER, BEFORE) or len(values) != len(self.names):
+            return AFTER, None
+        return direction, values
+
+    @staticmethod
+    def seek(ordering: List[str], values: List[Any]) -> Q:
+        """Условие «строго после курсора» для сортировки по полям.
+
+        (a, b) > (x, y) записывается как a >= x AND (a != x OR b > y),
+        чтобы база могла начать чтение индекса по первому полю.
+        """
+        condition = None
+        for field, value in reversed(list(zip(ordering, values))):
+            name = field.lstrip('-')
+            lookup = f'{name}__{"lt" if field.startswith("-") else "gt"}'
+            if condition is None:
+                condition = Q(**{lookup: value})
+            else:
+                condition = Q(**{f'{lookup}e': value}) & (
+                    ~Q(**{name: value}) | condition
+                )
+        return condition
+
+    @property
+    def names(self) -> List[str]:
+        return [field.lstrip('-') for field in self.ordering]
+
+    def field(self, name: str) -> Any:
+        annotation = self.object_list.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        opts = self.object_list.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    @staticmethod
+    def invert(field: str) -> str:
+        return field[1:] if field.startswith('-') else f'-{field}'
+
 
 def paginate(
     request: HttpRequest,
     queryset: QuerySet,
     per_page: int = settings.NUM_OBJECTS_ON_PAGE,
+    keyset: bool = False,
+    count: Optional[int] = None,
 ) -> Page:
     """Список материалов сайта разбивает постранично.
 
@@ -15,11 +163,22 @@ def paginate(
         request: Объект запроса.
         queryset: QuerySet, который необходимо разбить на страницы.
         per_page: Максимальное количество элементов для включения на страницу.
+        keyset: Разбивать по курсору из параметра cursor, а не по номеру
+            страницы из параметра page.
+        count: Заранее известное количество элементов, например из
+            счётчика; тогда COUNT(*) не выполняется.
 
     Returns:
         Объект Page.
     """
-    return Paginator(queryset, per_page).get_page(request.GET.get('page'))
+    if keyset:
+        return KeysetPaginator(queryset, per_page).get_page(
+            request.GET.get('cursor'),
+        )
+    paginator = Paginator(queryset, per_page)
+    if count is not None:
+        paginator.count = count
+    return paginator.get_page(request.GET.get('page'))
 
 
 def cut_string(
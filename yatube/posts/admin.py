@@ -1,30 +1,150 @@
-from django.contrib import admin
+from typing import Callable, Tuple
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.http import HttpRequest
 
 from core.admin import BaseAdmin
-from posts.models import Comment, Follow, Group, Post
+from core.tasks import start_batch
+from posts import tasks
+from posts.models import Comment, Follow, Group, Post, User
+
+
+class PostActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        Group.objects.all(),
+        required=False,
+        label='Группа',
+    )
 
 
 @admin.register(Post)
 class PostAdmin(BaseAdmin):
     list_display = ('pk', 'text', 'created', 'author', 'group')
-    list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('group',)
     search_fields = ('text',)
     list_filter = ('created',)
+    action_form = PostActionForm
+    actions = ('delete_posts', 'set_group', 'clear_images')
+
+    def get_actions(self, request: HttpRequest) -> dict:
+        # Удаление одной транзакцией блокирует базу на всё время
+        # каскада, поэтому посты удаляются порциями в фоне.
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def start_batch(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        action: Callable,
+        description: str,
+        **options,
+    ) -> None:
+        batch = start_batch(
+            action,
+            list(queryset.values_list('pk', flat=True)),
+            description,
+            request.user,
+            **options,
+        )
+        self.message_user(
+            request,
+            f'Операция «{batch}» запущена в фоне. Ход выполнения — '
+            'в разделе «Пакетные операции».',
+        )
+
+    def delete_posts(self, request: HttpRequest, queryset: QuerySet) -> None:
+        self.start_batch(
+            request,
+            queryset,
+            tasks.delete_posts,
+            'Удаление постов',
+        )
+
+    delete_posts.short_description = 'Удалить выбранные посты'
+    delete_posts.allowed_permissions = ('delete',)
+
+    def set_group(self, request: HttpRequest, queryset: QuerySet) -> None:
+        form = self.action_form(request.POST, auto_id=None)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid() or form.cleaned_data['group'] is None:
+            self.message_user(
+                request,
+                'Выберите группу, в которую перенести посты.',
+                messages.ERROR,
+            )
+            return
+        self.start_batch(
+            request,
+            queryset,
+            tasks.set_group,
+            'Смена группы постов',
+            group_id=form.cleaned_data['group'].pk,
+        )
+
+    set_group.short_description = 'Перенести выбранные посты в группу'
+    set_group.allowed_permissions = ('change',)
+
+    def clear_images(self, request: HttpRequest, queryset: QuerySet) -> None:
+        self.start_batch(
+            request,
+            queryset,
+            tasks.clear_images,
+            'Удаление картинок постов',
+        )
+
+    clear_images.short_description = 'Убрать картинки выбранных постов'
+    clear_images.allowed_permissions = ('change',)
+
+    def save_model(
+        self,
+        request: HttpRequest,
+        obj: Post,
+        form: forms.ModelForm,
+        change: bool,
+    ) -> None:
+        super().save_model(request, obj, form, change)
+        if 'image' in form.changed_data:
+            tasks.generate_thumbnail.delay(obj.pk)
 
 
 @admin.register(Group)
 class GroupAdmin(BaseAdmin):
     list_display = ('pk', 'title', 'slug', 'description')
-    search_fields = ('slug',)
+    search_fields = ('slug', 'title')
 
 
 @admin.register(Comment)
 class CommentAdmin(BaseAdmin):
     list_display = ('pk', 'post', 'author', 'text')
+    list_select_related = ('post', 'author')
+    raw_id_fields = ('post', 'author')
     search_fields = ('text',)
 
 
 @admin.register(Follow)
 class FollowAdmin(BaseAdmin):
-    list_display = ('pk', '__str__')
-    search_fields = ('user',)
+    list_display = ('pk', 'user', 'author')
+    list_select_related = ('user', 'author')
+    raw_id_fields = ('user', 'author')
+    search_fields = ('user__username', 'author__username')
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> Tuple[QuerySet, bool]:
+        # Точное совпадение имени ищется по уникальному индексу, а не
+        # перебором всех подписок через LIKE.
+        if not search_term.strip():
+            return queryset, False
+        users = User.objects.filter(username=search_term.strip()).values('pk')
+        return queryset.filter(Q(user__in=users) | Q(author__in=users)), False
@@ -0,0 +1,227 @@
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import groupby, islice
+from typing import Any, Dict, Iterable, Iterator, List, Set, TextIO, Tuple
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Model
+
+from core.cache import bump_generation
+from posts import counters, feed, ranking, search
+from posts.models import Comment, Follow, Group, Post, User
+
+# Порядок важен: модели идут после тех, на которые ссылаются.
+MODELS = (User, Group, Post, Comment, Follow)
+
+BATCH_SIZE = 1000
+
+
+class Encoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder отбрасывает микросекунды, а по ним упорядочены
+    # посты и работает постраничный вывод по курсору.
+    def default(self, o: Any) -> Any:
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_models() -> Dict[str, type]:
+    return {model._meta.label_lower: model for model in MODELS}
+
+
+def export(stream: TextIO) -> Dict[str, int]:
+    """Выгружает данные в формате JSON Lines.
+
+    Каждая строка — объект {"model": ..., "fields": {...}} со значениями
+    всех столбцов таблицы. Таблицы читаются порциями, поэтому память
+    не зависит от объёма данных.
+
+    Args:
+        stream: Текстовый поток для записи.
+
+    Returns:
+        Число выгруженных записей по моделям.
+    """
+    exported = {}
+    for label, model in get_models().items():
+        names = [field.attname for field in model._meta.concrete_fields]
+        exported[label] = 0
+        for values in (
+            model.objects.order_by('pk')
+            .values(*names)
+            .iterator(chunk_size=BATCH_SIZE)
+        ):
+            stream.write(
+                json.dumps(
+                    {'model': label, 'fields': values},
+                    cls=Encoder,
+                    ensure_ascii=False,
+                ),
+            )
+            stream.write('\n')
+            exported[label] += 1
+    return exported
+
+
+def parse(lines: Iterable[str]) -> Iterator[Model]:
+    """Превращает строки JSON Lines в несохранённые объекты моделей.
+
+    Args:
+        lines: Строки в формате export.
+
+    Returns:
+        Итератор объектов.
+    """
+    models = get_models()
+    for line in lines:
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        model = models[row['model']]
+        yield model(
+            **{
+                name: model._meta.get_field(name).to_python(value)
+                if value is not None
+                else None
+                for name, value in row['fields'].items()
+            },
+        )
+
+
+@contextmanager
+def preserve_timestamps() -> Iterator[None]:
+    # Иначе bulk_create заменит дату публикации текущим временем.
+    fields = [
+        field
+        for model in MODELS
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def model_indexes() -> Dict[str, Tuple[str, str]]:
+    """Возвращает неуникальные индексы, объявленные в моделях MODELS.
+
+    Это индексы внешних ключей и полей с db_index, а также
+    Meta.indexes.
+
+    Returns:
+        Словарь: имя индекса — таблица и SQL его создания.
+    """
+    schema_editor = connection.schema_editor()
+    return {
+        str(statement.parts['name']).strip('"'): (
+            model._meta.db_table,
+            str(statement),
+        )
+        for model in MODELS
+        for statement in schema_editor._model_indexes_sql(model)
+    }
+
+
+def existing_indexes(tables: Iterable[str]) -> Set[str]:
+    """Возвращает имена индексов, которые есть в таблицах."""
+    with connection.cursor() as cursor:
+        return {
+            name
+            for table in set(tables)
+            for name, constraint in connection.introspection.get_constraints(
+                cursor,
+                table,
+            ).items()
+            if constraint['index']
+        }
+
+
+@contextmanager
+def deferred_indexes() -> Iterator[None]:
+    """Удаляет неуникальные индексы на время загрузки и создаёт заново.
+
+    Построить индекс по готовой таблице быстрее, чем обновлять его
+    при каждой вставке. Поддерживается только SQLite; уникальные
+    индексы остаются, чтобы не допустить дублей.
+
+    Индексы создаются заново по описанию моделей, а не по списку
+    удалённых. Поэтому если прерванная загрузка оставила их
+    удалёнными, повторный запуск их восстановит.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    indexes = model_indexes()
+    tables = [table for table, _ in indexes.values()]
+    with connection.cursor() as cursor:
+        for name in existing_indexes(tables) & indexes.keys():
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    try:
+        yield
+    finally:
+        existing = existing_indexes(tables)
+        with connection.cursor() as cursor:
+            for name, (_, sql) in indexes.items():
+                if name not in existing:
+                    cursor.execute(sql)
+
+
+def index_batch(model: type, batch: List[Model]) -> None:
+    """Добавляет загруженные посты и комментарии в поисковый индекс."""
+    if model is Post:
+        search.index(
+            (search.post_rowid(post.pk), post.pk, post.text) for post in batch
+        )
+    elif model is Comment:
+        search.index(
+            (search.comment_rowid(comment.pk), comment.post_id, comment.text)
+            for comment in batch
+        )
+
+
+def load(lines: Iterable[str]) -> Dict[str, int]:
+    """Загружает данные, выгруженные export.
+
+    Объекты вставляются порциями по BATCH_SIZE с сохранением
+    первичных ключей и дат. Каждая порция фиксируется отдельной
+    транзакцией вместе с поисковым индексом, поэтому загрузка не
+    держит базу заблокированной и не копит журнал. Уже загруженные
+    объекты пропускаются, так что прерванную загрузку можно
+    повторить. Сигналы при этом не срабатывают, поэтому после
+    загрузки пересчитываются счётчики, ленты и рейтинги.
+
+    Args:
+        lines: Строки в формате export.
+
+    Returns:
+        Число обработанных записей по моделям.
+    """
+    loaded = {}
+    with preserve_timestamps(), deferred_indexes():
+        for model, objects in groupby(parse(lines), key=type):
+            label = model._meta.label_lower
+            loaded.setdefault(label, 0)
+            while True:
+                batch = list(islice(objects, BATCH_SIZE))
+                if not batch:
+                    break
+                with transaction.atomic():
+                    model.objects.bulk_create(batch, ignore_conflicts=True)
+                    index_batch(model, batch)
+                loaded[label] += len(batch)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), MODELS):
+                cursor.execute(sql)
+        counters.reconcile()
+        feed.rebuild()
+        ranking.rebuild()
+    bump_generation('index_page', 'post_page')
+    return loaded
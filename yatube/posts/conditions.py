@@ -0,0 +1,92 @@
+from hashlib import md5
+from typing import Optional
+
+from django.db.models import Exists, Max, OuterRef
+from django.http import HttpRequest
+from django.utils.encoding import force_bytes
+
+from core import objects
+from core.cache import get_generation
+from posts.models import Follow, Group, Post, User
+
+# Валидаторы для условных GET-запросов. Каждый выполняет один запрос
+# по индексу и возвращает ETag либо None, если объекта нет, — тогда
+# представление само ответит 404. Отсутствие объекта проверяется по
+# кэшу объектов, чтобы перебор несуществующих адресов не доходил до
+# базы. Страница зависит и от пользователя, поэтому его id тоже
+# входит в ETag. Имена авторов и комментаторов и названия групп
+# выводятся на всех страницах, поэтому их переименование учитывается
+# через поколение names, а не через поля каждой страницы.
+
+
+def make_etag(request: HttpRequest, values: Optional[tuple]) -> Optional[str]:
+    if values is None:
+        return None
+    return md5(
+        force_bytes(
+            repr((request.user.pk, get_generation('names'), *values)),
+        ),
+    ).hexdigest()
+
+
+def post_detail_etag(request: HttpRequest, pk: int) -> Optional[str]:
+    if objects.get(Post, pk=pk) is None:
+        return None
+    # Новые и удалённые комментарии меняют comments_count.
+    return make_etag(
+        request,
+        Post.objects.filter(pk=pk)
+        .values_list(
+            'created',
+            'modified',
+            'comments_count',
+            'author__counter__posts_count',
+            'author__first_name',
+            'author__last_name',
+            'group__slug',
+        )
+        .first(),
+    )
+
+
+def profile_etag(request: HttpRequest, username: str) -> Optional[str]:
+    if objects.get(User, username=username) is None:
+        return None
+    return make_etag(
+        request,
+        User.objects.filter(username=username)
+        .annotate(
+            latest=Max('posts__created'),
+            edited=Max('posts__modified'),
+            followed=Exists(
+                Follow.objects.filter(
+                    user_id=request.user.pk,
+                    author=OuterRef('pk'),
+                ),
+            ),
+        )
+        .values_list(
+            'first_name',
+            'last_name',
+            'counter__posts_count',
+            'latest',
+            'edited',
+            'followed',
+        )
+        .first(),
+    )
+
+
+def group_etag(request: HttpRequest, slug: str) -> Optional[str]:
+    if objects.get(Group, slug=slug) is None:
+        return None
+    return make_etag(
+        request,
+        Group.objects.filter(slug=slug)
+        .annotate(
+            latest=Max('posts__created'),
+            edited=Max('posts__modified'),
+        )
+        .values_list('title', 'description', 'posts_count', 'latest', 'edited')
+        .first(),
+    )
@@ -0,0 +1,162 @@
+from typing import Dict
+
+from django.db.models import Count, F, Value
+from django.db.models.expressions import Combinable
+from django.db.models.functions import Greatest
+
+from core import objects
+from posts.models import AuthorCounter, Follow, Group, Post, User
+
+
+def shifted(field: str, delta: int) -> Combinable:
+    """Выражение для сдвига счётчика, который не опускается ниже нуля."""
+    return Greatest(F(field) + delta, Value(0))
+
+
+def change_author(author_id: int, field: str, delta: int) -> None:
+    """Меняет счётчик автора.
+
+    Если счётчиков ещё нет, они создаются по фактическим данным.
+
+    Args:
+        author_id: id автора.
+        field: Имя счётчика.
+        delta: На сколько изменилось значение.
+    """
+    if not AuthorCounter.objects.filter(author_id=author_id).update(
+        **{field: shifted(field, delta)},
+    ):
+        AuthorCounter.objects.get_or_create(
+            author_id=author_id,
+            defaults={
+                'posts_count': Post.objects.filter(
+                    author_id=author_id,
+                ).count(),
+                'followers_count': Follow.objects.filter(
+                    author_id=author_id,
+                ).count(),
+            },
+        )
+    objects.forget_pk(AuthorCounter, author_id)
+
+
+def change_author_posts(author_id: int, delta: int) -> None:
+    """Меняет счётчик постов автора.
+
+    Args:
+        author_id: id автора.
+        delta: На сколько изменилось число постов.
+    """
+    change_author(author_id, 'posts_count', delta)
+
+
+def change_author_followers(author_id: int, delta: int) -> None:
+    """Меняет счётчик подписчиков автора.
+
+    Args:
+        author_id: id автора.
+        delta: На сколько изменилось число подписчиков.
+    """
+    change_author(author_id, 'followers_count', delta)
+
+
+def change_group_posts(group_id: int, delta: int) -> None:
+    """Меняет счётчик постов группы.
+
+    Args:
+        group_id: id группы.
+        delta: На сколько изменилось число постов.
+    """
+    Group.objects.filter(pk=group_id).update(
+        posts_count=shifted('posts_count', delta),
+    )
+    objects.forget_pk(Group, group_id)
+
+
+def change_post_comments(post_id: int, delta: int) -> None:
+    """Меняет счётчик комментариев поста.
+
+    Args:
+        post_id: id поста.
+        delta: На сколько изменилось число комментариев.
+    """
+    Post.objects.filter(pk=post_id).update(
+        comments_count=shifted('comments_count', delta),
+    )
+    objects.forget_pk(Post, post_id)
+
+
+def author_posts(author: User) -> int:
+    """Возвращает число постов автора по счётчику.
+
+    Args:
+        author: Автор.
+
+    Returns:
+        Число постов автора.
+    """
+    try:
+        return author.counter.posts_count
+    except AuthorCounter.DoesNotExist:
+        return 0
+
+
+def reconcile() -> Dict[str, int]:
+    """Сверяет счётчики с фактическими данными и исправляет расхождения.
+
+    Returns:
+        Число исправленных счётчиков по видам.
+    """
+    fixed = {'authors': 0, 'groups': 0, 'posts': 0}
+    actual = {
+        'posts_count': dict(
+            Post.objects.order_by()
+            .values('author')
+            .annotate(total=Count('pk'))
+            .values_list('author', 'total'),
+        ),
+        'followers_count': dict(
+            Follow.objects.order_by()
+            .values('author')
+            .annotate(total=Count('pk'))
+            .values_list('author', 'total'),
+        ),
+    }
+    missing = set().union(*actual.values())
+    for counter in AuthorCounter.objects.iterator():
+        missing.discard(counter.author_id)
+        changed = []
+        for field, totals in actual.items():
+            total = totals.get(counter.author_id, 0)
+            if getattr(counter, field) != total:
+                setattr(counter, field, total)
+                changed.append(field)
+        if changed:
+            counter.save(update_fields=changed)
+            fixed['authors'] += 1
+    AuthorCounter.objects.bulk_create(
+        AuthorCounter(
+            author_id=author_id,
+            **{
+                field: totals.get(author_id, 0)
+                for field, totals in actual.items()
+            },
+        )
+        for author_id in missing
+    )
+    for author_id in missing:
+        objects.forget_pk(AuthorCounter, author_id)
+    fixed['authors'] += len(missing)
+    for group in Group.objects.annotate(actual=Count('posts')).exclude(
+        posts_count=F('actual'),
+    ):
+        Group.objects.filter(pk=group.pk).update(posts_count=group.actual)
+        objects.forget_pk(Group, group.pk)
+        fixed['groups'] += 1
+    for post in Post.objects.annotate(actual=Count('comments')).exclude(
+        comments_count=F('actual'),
+    ):
+        Post.objects.filter(pk=post.pk).update(comments_count=post.actual)
+        objects.forget_pk(Post, post.pk)
+        fixed['posts'] += 1
+    return fixed
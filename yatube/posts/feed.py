@@ -0,0 +1,202 @@
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.query import QuerySet
+
+from posts.models import AuthorCounter, FeedEntry, Follow, Post, User
+
+PULL_AUTHORS_KEY = 'feed:pull_authors'
+
+
+def get_pull_authors() -> List[int]:
+    """Возвращает авторов, посты которых не раскладываются по лентам.
+
+    У таких авторов подписчиков больше, чем FEED_FANOUT_LIMIT, поэтому
+    их посты подмешиваются в ленту при чтении.
+
+    Returns:
+        Список id авторов.
+    """
+    authors = cache.get(PULL_AUTHORS_KEY)
+    if authors is None:
+        authors = list(
+            AuthorCounter.objects.filter(
+                followers_count__gt=settings.FEED_FANOUT_LIMIT,
+            ).values_list('author', flat=True),
+        )
+        cache.set(
+            PULL_AUTHORS_KEY,
+            authors,
+            settings.FEED_PULL_AUTHORS_TIMEOUT,
+        )
+    return authors
+
+
+def push_post(post: Post) -> None:
+    """Раскладывает новый пост по лентам подписчиков автора.
+
+    Args:
+        post: Опубликованный пост.
+    """
+    followers = Follow.objects.filter(author_id=post.author_id)
+    if followers.count() > settings.FEED_FANOUT_LIMIT:
+        if post.author_id not in get_pull_authors():
+            cache.delete(PULL_AUTHORS_KEY)
+        return
+    FeedEntry.objects.bulk_create(
+        (
+            FeedEntry(user_id=user_id, post=post, created=post.created)
+            for user_id in followers.values_list('user', flat=True)
+        ),
+        batch_size=settings.FEED_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def follow(user_id: int, author_id: int) -> bool:
+    """Добавляет подписку одним INSERT, пропуская уже существующую.
+
+    В отличие от get_or_create, повторный или одновременный запрос не
+    может создать дубль или упасть на ограничении уникальности.
+    Сигналы post_save при этом не отправляются, поэтому после
+    добавления нужно вызвать signals.follow_created.
+
+    Args:
+        user_id: id подписчика.
+        author_id: id автора.
+
+    Returns:
+        True, если подписка добавлена этим вызовом.
+    """
+    table = connection.ops.quote_name(Follow._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{connection.ops.insert_statement(ignore_conflicts=True)} '
+            f'{table} (user_id, author_id) VALUES (%s, %s) '
+            f'{connection.ops.ignore_conflicts_suffix_sql(True)}',
+            (user_id, author_id),
+        )
+        return cursor.rowcount == 1
+
+
+def fill(follows: QuerySet) -> None:
+    """Добавляет в ленты последние посты авторов одним запросом.
+
+    Для каждой подписки в ленту попадают FEED_BACKFILL_LIMIT последних
+    постов автора; записи, которые уже есть, пропускаются. Подписки на
+    авторов, посты которых подмешиваются при чтении, не учитываются.
+
+    Args:
+        follows: QuerySet подписок.
+    """
+    follows_sql, follows_params = (
+        follows.exclude(
+            author__counter__followers_count__gt=settings.FEED_FANOUT_LIMIT,
+        )
+        .order_by()
+        .values_list('user', 'author')
+        .query.sql_with_params()
+    )
+    feed_table = connection.ops.quote_name(FeedEntry._meta.db_table)
+    post_table = connection.ops.quote_name(Post._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{connection.ops.insert_statement(ignore_conflicts=True)} '
+            f'{feed_table} (user_id, post_id, created) '
+            'SELECT follow.user_id, post.id, post.created '
+            f'FROM ({follows_sql}) follow '
+            f'INNER JOIN {post_table} post ON post.id IN ('
+            f'SELECT id FROM {post_table} '
+            'WHERE author_id = follow.author_id '
+            'ORDER BY created DESC LIMIT %s) '
+            f'{connection.ops.ignore_conflicts_suffix_sql(True)}',
+            (*follows_params, settings.FEED_BACKFILL_LIMIT),
+        )
+
+
+def backfill(user_id: int, author_id: int) -> None:
+    """Добавляет в ленту подписчика последние посты автора.
+
+    Args:
+        user_id: id подписчика.
+        author_id: id автора.
+    """
+    fill(Follow.objects.filter(user_id=user_id, author_id=author_id))
+
+
+def catch_up(author_id: int) -> None:
+    """Раскладывает посты автора, который снова пишет в ленты.
+
+    Пока подписчиков было больше FEED_FANOUT_LIMIT, посты автора не
+    попадали в ленты и подмешивались при чтении. Когда подписчиков
+    становится меньше, эти посты нужно добавить в ленты, иначе они
+    пропадут.
+
+    Args:
+        author_id: id автора.
+    """
+    fill(Follow.objects.filter(author_id=author_id))
+    cache.delete(PULL_AUTHORS_KEY)
+
+
+def purge(user_id: int, author_id: int) -> None:
+    """Убирает из ленты подписчика посты автора.
+
+    Args:
+        user_id: id подписчика.
+        author_id: id автора.
+    """
+    FeedEntry.objects.filter(
+        user_id=user_id,
+        post__author_id=author_id,
+    ).delete()
+
+
+def get_feed(user: User) -> QuerySet:
+    """Возвращает ленту постов авторов, на которых подписан пользователь.
+
+    Обычно это один проход по индексу (user, -created) таблицы ленты.
+    Посты авторов с большим числом подписчиков подмешиваются при чтении.
+
+    Args:
+        user: Пользователь, для которого строится лента.
+
+    Returns:
+        QuerySet постов.
+    """
+    pull_authors = get_pull_authors()
+    followed = (
+        list(
+            Follow.objects.filter(
+                user=user,
+                author__in=pull_authors,
+            ).values_list('author', flat=True),
+        )
+        if pull_authors
+        else []
+    )
+    if not followed:
+        # Аннотация использует соединение из filter, поэтому курсор
+        # по ней не добавляет второго соединения с таблицей ленты.
+        return (
+            Post.objects.filter(feed_entries__user=user)
+            .annotate(feed_created=F('feed_entries__created'))
+            .order_by('-feed_created')
+        )
+    return Post.objects.filter(
+        Q(pk__in=FeedEntry.objects.filter(user=user).values('post'))
+        | Q(author__in=followed),
+    )
+
+
+def rebuild() -> None:
+    """Заново строит ленты всех подписчиков по таблице подписок.
+
+    Нужно после массовой загрузки данных в обход сигналов.
+    """
+    FeedEntry.objects.all().delete()
+    cache.delete(PULL_AUTHORS_KEY)
+    fill(Follow.objects.all())
@@ -1,5 +1,6 @@
 from django import forms
 
+from posts import tasks
 from posts.models import Comment, Post
 
 
@@ -8,6 +9,12 @@ class PostForm(forms.ModelForm):
         model = Post
         fields = ('text', 'group', 'image')
 
+    def save(self, commit: bool = True) -> Post:
+        post = super().save(commit)
+        if commit and 'image' in self.changed_data:
+            tasks.generate_thumbnail.delay(post.pk)
+        return post
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,190 @@
+import json
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from core.profiling import percentile
+from posts.models import Group, Post, User
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время ответа и число SQL-запросов основных страниц '
+        'на синтетических данных разного объёма. Данные создаются во '
+        'временной тестовой базе, рабочая база не затрагивается.'
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--sizes',
+            default='100,1000,10000',
+            help='Число постов на каждом шаге через запятую.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Число запросов к каждой странице.',
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark.json',
+            help='Файл для результатов в формате JSON.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        if settings.DEBUG:
+            self.stderr.write(
+                'Включён DEBUG: debug_toolbar искажает результаты замеров.',
+            )
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0,
+            autoclobber=True,
+        )
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                with override_settings(
+                    MEDIA_ROOT=directory,
+                    CACHES={
+                        'default': {
+                            'BACKEND': 'core.cache_backends.SQLiteCache',
+                            'LOCATION': str(Path(directory) / 'cache.db'),
+                        },
+                    },
+                ):
+                    results = self.run(sizes, options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        Path(options['output']).write_text(
+            json.dumps(
+                {
+                    'date': timezone.now().isoformat(),
+                    'repeat': options['repeat'],
+                    'debug': settings.DEBUG,
+                    'results': results,
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Результаты записаны в {options["output"]}.'),
+        )
+
+    def run(self, sizes: list, repeat: int) -> list:
+        results = []
+        seeded = 0
+        for size in sizes:
+            added = size - seeded
+            call_command(
+                'seed',
+                users=max(added // 10, 2),
+                groups=10 if not seeded else 0,
+                posts=added,
+                comments=added * 3,
+                seed=size,
+                stdout=StringIO(),
+            )
+            seeded = size
+            views = {
+                name: self.measure(client, url, repeat)
+                for name, client, url in self.targets()
+            }
+            results.append(
+                {
+                    'posts': Post.objects.count(),
+                    'users': User.objects.count(),
+                    'views': views,
+                },
+            )
+            for name, stats in views.items():
+                self.stdout.write(
+                    f'{size:>8} {name:<20} '
+                    f'p50 {stats["p50_ms"]:8.2f} мс  '
+                    f'p95 {stats["p95_ms"]:8.2f} мс  '
+                    f'SQL {stats["queries_cold"]}/{stats["queries_warm"]}',
+                )
+        return results
+
+    def targets(self) -> list:
+        """Выбирает самые тяжёлые страницы текущего набора данных."""
+        anonymous = Client()
+        follower = Client()
+        follower.force_login(
+            User.objects.annotate(follows=Count('follower'))
+            .order_by('-follows')
+            .first(),
+        )
+        group = (
+            Group.objects.annotate(posts_total=Count('posts'))
+            .order_by('-posts_total')
+            .first()
+        )
+        author = (
+            User.objects.annotate(posts_total=Count('posts'))
+            .order_by('-posts_total')
+            .first()
+        )
+        post = Post.objects.order_by('-comments_count').first()
+        # HTML-страницы и JSON API замеряются на одних и тех же данных.
+        return [
+            (name, client, reverse(name, args=args))
+            for namespace in ('posts', 'api')
+            for name, client, args in (
+                (f'{namespace}:index', anonymous, ()),
+                (f'{namespace}:popular', anonymous, ()),
+                (f'{namespace}:group_list', anonymous, (group.slug,)),
+                (f'{namespace}:profile', anonymous, (author.username,)),
+                (f'{namespace}:post_detail', anonymous, (post.pk,)),
+                (f'{namespace}:follow_index', follower, ()),
+            )
+        ]
+
+    @staticmethod
+    def measure(client: Client, url: str, repeat: int) -> dict:
+        """Замеряет страницу: первый запрос с пустым кэшем и повторные.
+
+        Args:
+            client: Клиент, от имени которого выполняются запросы.
+            url: Адрес страницы.
+            repeat: Число запросов.
+
+        Returns:
+            Время ответа в миллисекундах и число SQL-запросов.
+        """
+        cache.clear()
+        durations = []
+        queries = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                client.get(url)
+                durations.append((time.perf_counter() - start) * 1000)
+            queries.append(len(context))
+        ordered = sorted(durations)
+        return {
+            'cold_ms': durations[0],
+            'p50_ms': percentile(ordered, 50),
+            'p95_ms': percentile(ordered, 95),
+            'queries_cold': queries[0],
+            'queries_warm': queries[-1],
+        }
@@ -0,0 +1,36 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts import bulk
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает пользователей, группы, посты, комментарии и подписки '
+        'в формате JSON Lines.'
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            'path',
+            nargs='?',
+            default='-',
+            help='Файл для выгрузки; .gz сжимается, «-» — stdout.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        path = options['path']
+        if path == '-':
+            exported = bulk.export(sys.stdout)
+        else:
+            opener = gzip.open if path.endswith('.gz') else open
+            with opener(path, 'wt', encoding='utf-8') as stream:
+                exported = bulk.export(stream)
+        self.stderr.write(
+            self.style.SUCCESS(
+                'Выгружено: '
+                + ', '.join(f'{label} — {n}' for label, n in exported.items()),
+            ),
+        )
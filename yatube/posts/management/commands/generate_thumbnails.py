@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from posts import thumbnails
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт миниатюры для постов с картинками.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать миниатюры и у постов, где они уже есть.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        posts = Post.objects.exclude(image='')
+        if not options['all']:
+            posts = posts.filter(thumbnail_url='')
+        generated = 0
+        for post in posts.only('pk', 'image').iterator():
+            thumbnails.generate(post)
+            generated += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Создано миниатюр: {generated}.'),
+        )
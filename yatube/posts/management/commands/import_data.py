@@ -0,0 +1,31 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts import bulk
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные, выгруженные командой export_data.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            'path',
+            help='Файл выгрузки; .gz читается со сжатием, «-» — stdin.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        path = options['path']
+        if path == '-':
+            loaded = bulk.load(sys.stdin)
+        else:
+            opener = gzip.open if path.endswith('.gz') else open
+            with opener(path, 'rt', encoding='utf-8') as stream:
+                loaded = bulk.load(stream)
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Загружено: '
+                + ', '.join(f'{label} — {n}' for label, n in loaded.items()),
+            ),
+        )
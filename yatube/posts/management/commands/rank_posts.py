@@ -0,0 +1,47 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import ranking
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги постов с новой активностью для страницы '
+        'популярного. Без --once работает постоянно.'
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Пересчитать рейтинги один раз и завершиться.',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Сначала пересчитать рейтинги всех свежих постов.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=settings.RANKING_INTERVAL,
+            help='Пауза между пересчётами в секундах.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        stop = threading.Event()
+        if not options['once']:
+            signal.signal(signal.SIGINT, lambda *args: stop.set())
+            signal.signal(signal.SIGTERM, lambda *args: stop.set())
+        changed = ranking.rebuild() if options['rebuild'] else 0
+        while not stop.is_set():
+            changed += ranking.update()
+            if options['once']:
+                break
+            stop.wait(options['interval'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Изменено рейтингов: {changed}.'),
+        )
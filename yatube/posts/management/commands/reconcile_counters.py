@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts import counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет счётчики постов, подписчиков и комментариев с '
+        'фактическими данными.'
+    )
+
+    def handle(self, *args, **options) -> None:
+        fixed = counters.reconcile()
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Исправлено счётчиков: авторов — {authors}, '
+                'групп — {groups}, постов — {posts}.'.format(**fixed),
+            ),
+        )
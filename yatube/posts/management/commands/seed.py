@@ -0,0 +1,242 @@
+from datetime import timedelta
+from io import BytesIO
+from random import Random
+from typing import List
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Model, Q
+from django.utils import timezone
+from faker import Faker
+from PIL import Image
+
+from core.cache import bump_generation
+from posts import counters, feed, ranking, search, thumbnails
+from posts.bulk import preserve_timestamps
+from posts.models import Comment, Follow, Group, Post, User
+
+BATCH_SIZE = 500
+
+SEED_IMAGES = 5
+
+SEED_PASSWORD = 'password'
+
+# Показатель степенного распределения популярности авторов.
+POPULARITY_EXPONENT = 1.2
+
+# Посты публикуются равномерно за этот период до запуска команды.
+SEED_PERIOD = timedelta(days=365)
+
+
+def last_pk(model: type) -> int:
+    return model.objects.aggregate(last=Max('pk'))['last'] or 0
+
+
+def created_after(model: type, pk: int) -> List[Model]:
+    # SQLite не возвращает pk из bulk_create.
+    return list(model.objects.filter(pk__gt=pk).order_by('pk'))
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, подписками, '
+        'постами и комментариями для нагрузочных замеров.'
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=3000)
+        parser.add_argument(
+            '--follows',
+            type=int,
+            default=10,
+            help='Среднее число подписок на пользователя.',
+        )
+        parser.add_argument(
+            '--images',
+            type=float,
+            default=0.2,
+            help='Доля постов с картинками.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options) -> None:
+        self.random = Random(options['seed'])
+        self.now = timezone.now()
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(options['seed'])
+        users = self.create_users(options['users'])
+        groups = self.create_groups(options['groups'])
+        authors = list(User.objects.all())
+        self.random.shuffle(authors)
+        weights = [
+            1 / (rank + 1) ** POPULARITY_EXPONENT
+            for rank in range(len(authors))
+        ]
+        self.create_follows(users, authors, weights, options['follows'])
+        posts = self.create_posts(
+            options['posts'],
+            authors,
+            weights,
+            groups or list(Group.objects.all()),
+            options['images'],
+        )
+        self.create_comments(options['comments'], posts, authors)
+        counters.reconcile()
+        # Ленты уже существующих подписчиков не перестраиваются:
+        # добавляются только новые подписки и авторы новых постов.
+        feed.fill(
+            Follow.objects.filter(
+                Q(user__in=users)
+                | Q(author__in={post.author_id for post in posts}),
+            ),
+        )
+        search.rebuild()
+        ranking.rebuild()
+        for post in Post.objects.exclude(image='').filter(thumbnail_url=''):
+            thumbnails.generate(post)
+        bump_generation('index_page', 'post_page')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Создано: пользователей — {len(users)}, '
+                f'групп — {len(groups)}, постов — {len(posts)}.',
+            ),
+        )
+
+    def create_users(self, number: int) -> List[User]:
+        pk = last_pk(User)
+        password = make_password(SEED_PASSWORD)
+        User.objects.bulk_create(
+            (
+                User(
+                    username=f'seed{pk + index}',
+                    first_name=self.fake.first_name(),
+                    last_name=self.fake.last_name(),
+                    password=password,
+                )
+                for index in range(1, number + 1)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        return created_after(User, pk)
+
+    def create_groups(self, number: int) -> List[Group]:
+        pk = last_pk(Group)
+        Group.objects.bulk_create(
+            Group(
+                title=self.fake.catch_phrase()[:200],
+                slug=f'seed-{pk + index}',
+                description=self.fake.paragraph(),
+            )
+            for index in range(1, number + 1)
+        )
+        return created_after(Group, pk)
+
+    def create_follows(
+        self,
+        users: List[User],
+        authors: List[User],
+        weights: List[float],
+        average: int,
+    ) -> None:
+        # Число подписок у пользователя и популярность автора
+        # распределены по степенному закону.
+        follows = (
+            Follow(user=user, author=author)
+            for user in users
+            for author in set(
+                self.random.choices(
+                    authors,
+                    weights,
+                    k=min(
+                        int(self.random.paretovariate(2) * average / 2),
+                        len(authors),
+                    ),
+                ),
+            )
+            if author != user
+        )
+        Follow.objects.bulk_create(
+            follows,
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    def create_images(self) -> List[str]:
+        names = []
+        for index in range(SEED_IMAGES):
+            name = f'posts/seed_{index}.jpg'
+            if not default_storage.exists(name):
+                content = BytesIO()
+                Image.new(
+                    'RGB',
+                    (1280, 720),
+                    tuple(self.random.randrange(256) for _ in range(3)),
+                ).save(content, 'jpeg')
+                name = default_storage.save(
+                    name,
+                    ContentFile(content.getvalue()),
+                )
+            names.append(name)
+        return names
+
+    def create_posts(
+        self,
+        number: int,
+        authors: List[User],
+        weights: List[float],
+        groups: List[Group],
+        images: float,
+    ) -> List[Post]:
+        pk = last_pk(Post)
+        names = self.create_images() if images else []
+        with preserve_timestamps():
+            Post.objects.bulk_create(
+                (
+                    Post(
+                        author=author,
+                        group=self.random.choice(groups + [None]),
+                        text=self.fake.paragraph(nb_sentences=5),
+                        image=(
+                            self.random.choice(names)
+                            if self.random.random() < images
+                            else ''
+                        ),
+                        created=self.now - SEED_PERIOD * self.random.random(),
+                    )
+                    for author in self.random.choices(
+                        authors,
+                        weights,
+                        k=number,
+                    )
+                ),
+                batch_size=BATCH_SIZE,
+            )
+        return created_after(Post, pk)
+
+    def create_comments(
+        self,
+        number: int,
+        posts: List[Post],
+        authors: List[User],
+    ) -> None:
+        if not posts:
+            return
+        with preserve_timestamps():
+            Comment.objects.bulk_create(
+                (
+                    Comment(
+                        post=post,
+                        author=self.random.choice(authors),
+                        text=self.fake.sentence(),
+                        created=post.created
+                        + (self.now - post.created) * self.random.random(),
+                    )
+                    for post in self.random.choices(posts, k=number)
+                ),
+                batch_size=BATCH_SIZE,
+            )
@@ -0,0 +1,95 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_feeds(apps, schema_editor):
+    # Как feed.fill: последние FEED_BACKFILL_LIMIT постов автора на
+    # подписку, без авторов, у которых больше FEED_FANOUT_LIMIT
+    # подписчиков. Счётчиков подписчиков ещё нет, поэтому они
+    # считаются по подпискам.
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    feed_table = quote(apps.get_model('posts', 'FeedEntry')._meta.db_table)
+    follow_table = quote(apps.get_model('posts', 'Follow')._meta.db_table)
+    post_table = quote(apps.get_model('posts', 'Post')._meta.db_table)
+    schema_editor.execute(
+        f'{connection.ops.insert_statement(ignore_conflicts=True)} '
+        f'{feed_table} (user_id, post_id, created) '
+        'SELECT follow.user_id, post.id, post.created '
+        f'FROM {follow_table} follow '
+        f'INNER JOIN {post_table} post ON post.id IN ('
+        f'SELECT id FROM {post_table} '
+        'WHERE author_id = follow.author_id '
+        'ORDER BY created DESC LIMIT %s) '
+        'WHERE follow.author_id NOT IN ('
+        f'SELECT author_id FROM {follow_table} '
+        'GROUP BY author_id HAVING COUNT(*) > %s) '
+        f'{connection.ops.ignore_conflicts_suffix_sql(True)}',
+        (settings.FEED_BACKFILL_LIMIT, settings.FEED_FANOUT_LIMIT),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0008_auto_20230302_2105'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'created',
+                    models.DateTimeField(verbose_name='дата публикации'),
+                ),
+                (
+                    'post',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='feed_entries',
+                        to='posts.Post',
+                        verbose_name='пост',
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='feed',
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='подписчик',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'записи ленты',
+                'ordering': ('-created',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(
+                fields=['user', '-created'],
+                name='posts_feede_user_id_de4f5a_idx',
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name='feedentry',
+            unique_together={('user', 'post')},
+        ),
+        migrations.RunPython(fill_feeds, migrations.RunPython.noop),
+    ]
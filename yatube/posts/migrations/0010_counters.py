@@ -0,0 +1,80 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    AuthorCounter = apps.get_model('posts', 'AuthorCounter')
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    AuthorCounter.objects.bulk_create(
+        AuthorCounter(author_id=author_id, posts_count=posts_count)
+        for author_id, posts_count in Post.objects.order_by()
+        .values('author')
+        .annotate(posts_count=Count('pk'))
+        .values_list('author', 'posts_count')
+    )
+    for group in Group.objects.annotate(actual=Count('posts')):
+        group.posts_count = group.actual
+        group.save(update_fields=('posts_count',))
+    for post in Post.objects.annotate(actual=Count('comments')).filter(
+        actual__gt=0,
+    ):
+        post.comments_count = post.actual
+        post.save(update_fields=('comments_count',))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0009_feedentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorCounter',
+            fields=[
+                (
+                    'author',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='counter',
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='автор',
+                    ),
+                ),
+                (
+                    'posts_count',
+                    models.PositiveIntegerField(
+                        default=0, verbose_name='количество постов'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'счётчики автора',
+                'verbose_name_plural': 'счётчики авторов',
+            },
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name='количество постов'
+            ),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name='количество комментариев',
+            ),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
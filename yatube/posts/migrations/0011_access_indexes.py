@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:48
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_follows(apps, schema_editor):
+    Follow = apps.get_model('posts', 'Follow')
+    keep = (
+        Follow.objects.values('user', 'author')
+        .annotate(keep=Min('pk'))
+        .values('keep')
+    )
+    Follow.objects.exclude(pk__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('posts', '0010_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_follows,
+            migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(
+                fields=['post', 'created'],
+                name='posts_comme_post_id_944a68_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['author', '-created'],
+                name='posts_post_author__6b945f_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['group', '-created'],
+                name='posts_post_group_i_88f0ea_idx',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'author'), name='unique_follow'
+            ),
+        ),
+    ]
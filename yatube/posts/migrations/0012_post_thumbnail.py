@@ -0,0 +1,36 @@
+# Generated by Django 2.2.16 on 2026-10-18 01:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('posts', '0011_access_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_height',
+            field=models.PositiveIntegerField(
+                editable=False, null=True, verbose_name='высота миниатюры'
+            ),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_url',
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=255,
+                verbose_name='адрес миниатюры',
+            ),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='thumbnail_width',
+            field=models.PositiveIntegerField(
+                editable=False, null=True, verbose_name='ширина миниатюры'
+            ),
+        ),
+    ]
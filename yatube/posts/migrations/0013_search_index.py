@@ -0,0 +1,62 @@
+from itertools import chain, islice
+
+from django.db import migrations
+
+from posts.stemming import normalize
+
+BATCH_SIZE = 1000
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE posts_search '
+        'USING fts5(body, post_id UNINDEXED)',
+    )
+    Comment = apps.get_model('posts', 'Comment')
+    Post = apps.get_model('posts', 'Post')
+    # rowid поста — pk * 2, комментария — pk * 2 + 1.
+    rows = chain(
+        (
+            (pk * 2, pk, text)
+            for pk, text in Post.objects.using(connection.alias)
+            .values_list('pk', 'text')
+            .iterator()
+        ),
+        (
+            (pk * 2 + 1, post_id, text)
+            for pk, post_id, text in Comment.objects.using(connection.alias)
+            .values_list('pk', 'post_id', 'text')
+            .iterator()
+        ),
+    )
+    with connection.cursor() as cursor:
+        while True:
+            batch = [
+                (rowid, post_id, ' '.join(normalize(text)))
+                for rowid, post_id, text in islice(rows, BATCH_SIZE)
+            ]
+            if not batch:
+                return
+            cursor.executemany(
+                'INSERT INTO posts_search (rowid, post_id, body) '
+                'VALUES (%s, %s, %s)',
+                batch,
+            )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE posts_search')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('posts', '0012_post_thumbnail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('posts', '0013_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['author', 'modified'],
+                name='posts_post_author__67ffce_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                fields=['group', 'modified'],
+                name='posts_post_group_i_46af26_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 2.2.16 on 2026-10-18 02:12
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def fill_followers(apps, schema_editor):
+    AuthorCounter = apps.get_model('posts', 'AuthorCounter')
+    Follow = apps.get_model('posts', 'Follow')
+    for author_id, followers_count in (
+        Follow.objects.order_by()
+        .values('author')
+        .annotate(followers_count=Count('pk'))
+        .values_list('author', 'followers_count')
+    ):
+        AuthorCounter.objects.update_or_create(
+            author_id=author_id,
+            defaults={'followers_count': followers_count},
+        )
+
+
+def track_posts(apps, schema_editor):
+    # Рейтинги посчитает команда rank_posts.
+    Post = apps.get_model('posts', 'Post')
+    PostScore = apps.get_model('posts', 'PostScore')
+    PostScore.objects.bulk_create(
+        PostScore(post_id=pk)
+        for pk in Post.objects.filter(
+            created__gte=timezone.now()
+            - timedelta(seconds=settings.RANKING_HORIZON),
+        ).values_list('pk', flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('posts', '0014_post_modified_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                (
+                    'post',
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name='ranking',
+                        serialize=False,
+                        to='posts.Post',
+                        verbose_name='пост',
+                    ),
+                ),
+                (
+                    'score',
+                    models.FloatField(default=0, verbose_name='рейтинг'),
+                ),
+                (
+                    'stale',
+                    models.BooleanField(
+                        default=True,
+                        verbose_name='требует пересчёта',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'рейтинг поста',
+                'verbose_name_plural': 'рейтинги постов',
+                'ordering': ('-score',),
+            },
+        ),
+        migrations.AddField(
+            model_name='authorcounter',
+            name='followers_count',
+            field=models.PositiveIntegerField(
+                default=0,
+                verbose_name='количество подписчиков',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='postscore',
+            index=models.Index(
+                fields=['-score'],
+                name='posts_posts_score_85a148_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='postscore',
+            index=models.Index(
+                fields=['stale'],
+                name='posts_posts_stale_b21be8_idx',
+            ),
+        ),
+        migrations.RunPython(fill_followers, migrations.RunPython.noop),
+        migrations.RunPython(track_posts, migrations.RunPython.noop),
+    ]
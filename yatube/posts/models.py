@@ -22,6 +22,11 @@ class Group(models.Model):
         'описание',
         help_text='Введите описание группы',
     )
+    posts_count = models.PositiveIntegerField(
+        'количество постов',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'группа'
@@ -41,11 +46,38 @@ class Post(TimestampedModel):
         help_text='Группа, к которой будет относиться пост',
     )
     image = models.ImageField('картинка', upload_to='posts/', blank=True)
+    thumbnail_url = models.CharField(
+        'адрес миниатюры',
+        max_length=255,
+        blank=True,
+        editable=False,
+    )
+    thumbnail_width = models.PositiveIntegerField(
+        'ширина миниатюры',
+        null=True,
+        editable=False,
+    )
+    thumbnail_height = models.PositiveIntegerField(
+        'высота миниатюры',
+        null=True,
+        editable=False,
+    )
+    comments_count = models.PositiveIntegerField(
+        'количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta(TimestampedModel.Meta):
         verbose_name = 'пост'
         verbose_name_plural = 'посты'
         default_related_name = 'posts'
+        indexes = (
+            models.Index(fields=('author', '-created')),
+            models.Index(fields=('group', '-created')),
+            models.Index(fields=('author', 'modified')),
+            models.Index(fields=('group', 'modified')),
+        )
 
     def __str__(self) -> str:
         return cut_string(self.text)
@@ -62,6 +94,7 @@ class Comment(TimestampedModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         default_related_name = 'comments'
+        indexes = (models.Index(fields=('post', 'created')),)
 
     def __str__(self) -> str:
         return cut_string(self.text)
@@ -84,6 +117,84 @@ class Follow(models.Model):
     class Meta:
         verbose_name = 'подписка'
         verbose_name_plural = 'подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='unique_follow',
+            ),
+        )
 
     def __str__(self) -> str:
         return f'`{self.user}` подписался на `{self.author}`'
+
+
+class AuthorCounter(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='автор',
+        related_name='counter',
+    )
+    posts_count = models.PositiveIntegerField('количество постов', default=0)
+    followers_count = models.PositiveIntegerField(
+        'количество подписчиков',
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = 'счётчики автора'
+        verbose_name_plural = 'счётчики авторов'
+
+    def __str__(self) -> str:
+        return f'Счётчики `{self.author}`'
+
+
+class FeedEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='подписчик',
+        related_name='feed',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='пост',
+        related_name='feed_entries',
+    )
+    created = models.DateTimeField('дата публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'записи ленты'
+        ordering = ('-created',)
+        unique_together = ('user', 'post')
+        indexes = (models.Index(fields=('user', '-created')),)
+
+    def __str__(self) -> str:
+        return f'`{self.post}` в ленте `{self.user}`'
+
+
+class PostScore(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        verbose_name='пост',
+        related_name='ranking',
+    )
+    score = models.FloatField('рейтинг', default=0)
+    stale = models.BooleanField('требует пересчёта', default=True)
+
+    class Meta:
+        verbose_name = 'рейтинг поста'
+        verbose_name_plural = 'рейтинги постов'
+        ordering = ('-score',)
+        indexes = (
+            models.Index(fields=('-score',)),
+            models.Index(fields=('stale',)),
+        )
+
+    def __str__(self) -> str:
+        return f'Рейтинг `{self.post}`'
@@ -0,0 +1,194 @@
+import math
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import (
+    Count,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Q,
+    Value,
+)
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from core.cache import bump_generation
+from posts.models import Post, PostScore
+
+
+def score(created: datetime, comments: int, followers: int) -> float:
+    """Считает рейтинг поста.
+
+    Активность поста — комментарии за первые RANKING_WINDOW секунд и
+    число подписчиков автора — затухает вдвое каждые
+    RANKING_HALF_LIFE секунд. Хранится логарифм: в нём затухание
+    превращается в слагаемое от даты публикации, которое не зависит
+    от текущего времени. Поэтому порядок постов не меняется со
+    временем и пересчитывать нужно только посты с новой активностью.
+
+    Args:
+        created: Дата публикации поста.
+        comments: Число комментариев за первые RANKING_WINDOW секунд.
+        followers: Число подписчиков автора.
+
+    Returns:
+        Рейтинг поста.
+    """
+    activity = (
+        1
+        + settings.RANKING_COMMENT_WEIGHT * comments
+        + settings.RANKING_FOLLOWER_WEIGHT * math.log2(1 + followers)
+    )
+    return math.log2(activity) + (
+        created.timestamp() / settings.RANKING_HALF_LIFE
+    )
+
+
+def get_popular() -> QuerySet:
+    """Возвращает посты по убыванию рейтинга.
+
+    Returns:
+        QuerySet постов.
+    """
+    return (
+        Post.objects.filter(ranking__isnull=False)
+        .annotate(rank=F('ranking__score'))
+        .order_by('-rank')
+    )
+
+
+def track(post_id: int) -> None:
+    """Заводит рейтинг нового поста, отмеченный к пересчёту.
+
+    Args:
+        post_id: id поста.
+    """
+    PostScore.objects.bulk_create(
+        (PostScore(post_id=post_id),),
+        ignore_conflicts=True,
+    )
+
+
+def mark_post(post_id: int) -> None:
+    """Отмечает рейтинг поста к пересчёту.
+
+    Args:
+        post_id: id поста, у которого изменились комментарии.
+    """
+    PostScore.objects.filter(post_id=post_id).update(stale=True)
+
+
+def mark_author(author_id: int) -> None:
+    """Отмечает к пересчёту рейтинги всех постов автора.
+
+    Args:
+        author_id: id автора, у которого изменилось число подписчиков.
+    """
+    PostScore.objects.filter(post__author_id=author_id).update(stale=True)
+
+
+def refresh() -> int:
+    """Пересчитывает рейтинги постов, отмеченных к пересчёту.
+
+    Отметка снимается до расчёта: если активность появится во время
+    расчёта, пост будет отмечен снова и пересчитан в следующий раз.
+
+    Returns:
+        Число пересчитанных постов.
+    """
+    window = ExpressionWrapper(
+        F('created')
+        + Value(
+            timedelta(seconds=settings.RANKING_WINDOW),
+            output_field=DurationField(),
+        ),
+        output_field=DateTimeField(),
+    )
+    refreshed = 0
+    while True:
+        ids = list(
+            PostScore.objects.filter(stale=True).values_list(
+                'post_id',
+                flat=True,
+            )[: settings.RANKING_BATCH_SIZE],
+        )
+        if not ids:
+            break
+        PostScore.objects.filter(post_id__in=ids).update(stale=False)
+        PostScore.objects.bulk_update(
+            [
+                PostScore(
+                    post_id=post_id,
+                    score=score(created, comments, followers or 0),
+                )
+                for post_id, created, comments, followers in (
+                    Post.objects.filter(pk__in=ids)
+                    .order_by()
+                    .annotate(
+                        recent=Count(
+                            'comments',
+                            filter=Q(comments__created__lt=window),
+                        ),
+                    )
+                    .values_list(
+                        'pk',
+                        'created',
+                        'recent',
+                        'author__counter__followers_count',
+                    )
+                )
+            ],
+            ('score',),
+        )
+        refreshed += len(ids)
+    return refreshed
+
+
+def prune() -> int:
+    """Удаляет рейтинги постов старше RANKING_HORIZON секунд.
+
+    Returns:
+        Число удалённых рейтингов.
+    """
+    deleted, _ = PostScore.objects.filter(
+        post__created__lt=timezone.now()
+        - timedelta(seconds=settings.RANKING_HORIZON),
+    ).delete()
+    return deleted
+
+
+def update() -> int:
+    """Пересчитывает отмеченные рейтинги и удаляет устаревшие.
+
+    Returns:
+        Число изменённых рейтингов.
+    """
+    changed = prune() + refresh()
+    if changed:
+        bump_generation('popular_page')
+    return changed
+
+
+def rebuild() -> int:
+    """Заново считает рейтинги всех постов за RANKING_HORIZON секунд.
+
+    Нужно после массовой загрузки данных в обход сигналов.
+
+    Returns:
+        Число изменённых рейтингов.
+    """
+    PostScore.objects.bulk_create(
+        (
+            PostScore(post_id=post_id)
+            for post_id in Post.objects.filter(
+                created__gte=timezone.now()
+                - timedelta(seconds=settings.RANKING_HORIZON),
+            ).values_list('pk', flat=True)
+        ),
+        batch_size=settings.RANKING_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    PostScore.objects.update(stale=True)
+    return update()
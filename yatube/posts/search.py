@@ -0,0 +1,149 @@
+from itertools import islice
+from typing import Iterable, List, Tuple
+
+from django.db import connection
+from django.db.models import QuerySet
+
+from posts.models import Comment, Post
+from posts.stemming import normalize
+
+TABLE = 'posts_search'
+
+# Записей индекса в одном executemany.
+BATCH_SIZE = 1000
+
+
+def post_rowid(pk: int) -> int:
+    return pk * 2
+
+
+def comment_rowid(pk: int) -> int:
+    return pk * 2 + 1
+
+
+def available() -> bool:
+    # Полнотекстовый индекс создаётся миграцией только в SQLite.
+    return connection.vendor == 'sqlite'
+
+
+def index(rows: Iterable[Tuple[int, int, str]]) -> None:
+    """Добавляет или обновляет записи индекса.
+
+    Записи читаются и пишутся порциями по BATCH_SIZE, поэтому память
+    не зависит от их числа.
+
+    Args:
+        rows: Кортежи из rowid записи, id поста и текста.
+    """
+    if not available():
+        return
+    rows = iter(rows)
+    with connection.cursor() as cursor:
+        while True:
+            batch = [
+                (rowid, post_id, ' '.join(normalize(text)))
+                for rowid, post_id, text in islice(rows, BATCH_SIZE)
+            ]
+            if not batch:
+                return
+            cursor.executemany(
+                f'INSERT OR REPLACE INTO {TABLE} (rowid, post_id, body) '
+                'VALUES (%s, %s, %s)',
+                batch,
+            )
+
+
+def unindex(rowid: int) -> None:
+    if not available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', (rowid,))
+
+
+def index_post(post_id: int) -> None:
+    post = Post.objects.filter(pk=post_id).values_list('text', flat=True)
+    if post:
+        index(((post_rowid(post_id), post_id, post[0]),))
+    else:
+        unindex(post_rowid(post_id))
+
+
+def index_comment(comment_id: int) -> None:
+    comment = Comment.objects.filter(pk=comment_id).values_list(
+        'post_id',
+        'text',
+    )
+    if comment:
+        index(((comment_rowid(comment_id), *comment[0]),))
+    else:
+        unindex(comment_rowid(comment_id))
+
+
+class SearchResults:
+    """Посты, найденные по запросу, в порядке релевантности.
+
+    Пост находится и по своему тексту, и по тексту комментариев.
+    Объект поддерживает count и срезы, поэтому его можно передать
+    в Paginator.
+    """
+
+    def __init__(self, query: str, queryset: QuerySet) -> None:
+        self.text = query
+        self.query = ' '.join(
+            f'"{word}"*' for word in dict.fromkeys(normalize(query))
+        )
+        self.queryset = queryset
+
+    def count(self) -> int:
+        if not self.query:
+            return 0
+        if not available():
+            return self.fallback().count()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(DISTINCT post_id) FROM {TABLE} '
+                f'WHERE {TABLE} MATCH %s',
+                (self.query,),
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, page: slice) -> List[Post]:
+        if not self.query:
+            return []
+        if not available():
+            return list(self.fallback()[page])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT post_id FROM {TABLE} WHERE {TABLE} MATCH %s '
+                'GROUP BY post_id ORDER BY MIN(rank) LIMIT %s OFFSET %s',
+                (self.query, page.stop - page.start, page.start),
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = self.queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+    def fallback(self) -> QuerySet:
+        return self.queryset.filter(text__icontains=self.text)
+
+
+def rebuild() -> None:
+    """Заново строит полнотекстовый индекс по всем постам и комментариям."""
+    if not available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE}')
+    index(
+        (post_rowid(pk), pk, text)
+        for pk, text in Post.objects.values_list('pk', 'text').iterator()
+    )
+    index(
+        (comment_rowid(pk), post_id, text)
+        for pk, post_id, text in Comment.objects.values_list(
+            'pk',
+            'post_id',
+            'text',
+        ).iterator()
+    )
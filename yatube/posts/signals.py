@@ -0,0 +1,187 @@
+from typing import FrozenSet, Optional
+
+from django.conf import settings
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core import objects
+from core.cache import bump_generation
+from posts import counters, feed, ranking, tasks
+from posts.models import AuthorCounter, Comment, Follow, Group, Post, User
+
+
+@receiver(post_save, sender=Post)
+def push_to_feeds(
+    sender: type,
+    instance: Post,
+    created: bool,
+    **kwargs,
+) -> None:
+    if created:
+        tasks.push_post.delay(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_index(sender: type, **kwargs) -> None:
+    bump_generation('index_page', 'popular_page', 'post_page')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_post_page(sender: type, **kwargs) -> None:
+    bump_generation('post_page')
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(
+    sender: type,
+    instance: User,
+    update_fields: Optional[FrozenSet[str]],
+    **kwargs,
+) -> None:
+    # Имя автора выводится в списках постов, а вход пользователя
+    # меняет только last_login.
+    if update_fields != frozenset(('last_login',)):
+        bump_generation('index_page', 'post_page', 'names')
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_names(sender: type, **kwargs) -> None:
+    bump_generation('names')
+
+
+@receiver(post_delete, sender=Follow)
+def purge_feed(sender: type, instance: Follow, **kwargs) -> None:
+    feed.purge(instance.user_id, instance.author_id)
+
+
+@receiver(post_init, sender=Post)
+def remember_group(sender: type, instance: Post, **kwargs) -> None:
+    if 'group_id' in instance.__dict__:
+        instance._saved_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(
+    sender: type,
+    instance: Post,
+    created: bool,
+    **kwargs,
+) -> None:
+    saved_group_id = getattr(instance, '_saved_group_id', None)
+    instance._saved_group_id = instance.group_id
+    regrouped = created or saved_group_id != instance.group_id
+    if created:
+        counters.change_author_posts(instance.author_id, 1)
+    elif regrouped and saved_group_id:
+        counters.change_group_posts(saved_group_id, -1)
+    if regrouped and instance.group_id:
+        counters.change_group_posts(instance.group_id, 1)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender: type, instance: Post, **kwargs) -> None:
+    counters.change_author_posts(instance.author_id, -1)
+    if instance.group_id:
+        counters.change_group_posts(instance.group_id, -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(
+    sender: type,
+    instance: Comment,
+    created: bool,
+    **kwargs,
+) -> None:
+    if created:
+        counters.change_post_comments(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender: type, instance: Comment, **kwargs) -> None:
+    counters.change_post_comments(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def index_post(sender: type, instance: Post, **kwargs) -> None:
+    tasks.index_post.delay(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def index_comment(sender: type, instance: Comment, **kwargs) -> None:
+    tasks.index_comment.delay(instance.pk)
+
+
+def follow_created(user_id: int, author_id: int) -> None:
+    """Обновляет счётчик, рейтинг и ленту после новой подписки.
+
+    Вызывается и из post_save, и после feed.follow, которая добавляет
+    подписку без сигналов.
+
+    Args:
+        user_id: id подписчика.
+        author_id: id автора.
+    """
+    counters.change_author_followers(author_id, 1)
+    ranking.mark_author(author_id)
+    tasks.backfill_feed.delay(user_id, author_id)
+
+
+@receiver(post_save, sender=Follow)
+def count_saved_follow(
+    sender: type,
+    instance: Follow,
+    created: bool,
+    **kwargs,
+) -> None:
+    if created:
+        follow_created(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def count_deleted_follow(sender: type, instance: Follow, **kwargs) -> None:
+    counters.change_author_followers(instance.author_id, -1)
+    ranking.mark_author(instance.author_id)
+    if AuthorCounter.objects.filter(
+        author_id=instance.author_id,
+        followers_count=settings.FEED_FANOUT_LIMIT,
+    ).exists():
+        # Автор снова пишет в ленты: нужно разложить посты, которые
+        # раньше подмешивались при чтении.
+        tasks.catch_up_feed.delay(instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def track_ranking(
+    sender: type,
+    instance: Post,
+    created: bool,
+    **kwargs,
+) -> None:
+    if created:
+        ranking.track(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def mark_ranking(sender: type, instance: Comment, **kwargs) -> None:
+    ranking.mark_post(instance.post_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=AuthorCounter)
+@receiver(post_delete, sender=AuthorCounter)
+def forget_cached_object(sender: type, instance: Model, **kwargs) -> None:
+    objects.forget(instance)
@@ -0,0 +1,73 @@
+import re
+from typing import List
+
+WORD = re.compile(r'\w+')
+
+VOWELS = 'аеиоуыэюя'
+
+# Окончания упрощённого стеммера Портера для русского языка
+# (Snowball), от самых длинных к коротким внутри каждой группы.
+PERFECTIVE_GERUND = re.compile(
+    r'((?<=[ая])(в|вши|вшись)|(ив|ивши|ившись|ыв|ывши|ывшись))$',
+)
+REFLEXIVE = re.compile(r'(ся|сь)$')
+ADJECTIVE = re.compile(
+    r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|'
+    r'их|ых|ую|юю|ая|яя|ою|ею)$',
+)
+PARTICIPLE = re.compile(
+    r'((?<=[ая])(ем|нн|вш|ющ|щ)|(ивш|ывш|ующ))$',
+)
+VERB = re.compile(
+    r'((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|'
+    r'нно)|(ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|'
+    r'ило|ыло|ено|ят|ует|уют|ит|ыт|ены|ить|ыть|ишь|ую|ю))$',
+)
+NOUN = re.compile(
+    r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|'
+    r'ием|ем|ам|ом|о|у|ах|иях|ях|ы|ь|ию|ью|ю|ия|ья|я)$',
+)
+SUPERLATIVE = re.compile(r'(ейш|ейше)$')
+
+
+def stem(word: str) -> str:
+    """Отбрасывает у русского слова окончание и суффиксы словоизменения.
+
+    Args:
+        word: Слово в нижнем регистре.
+
+    Returns:
+        Основа слова.
+    """
+    word = word.replace('ё', 'е')
+    start = next(
+        (index + 1 for index, char in enumerate(word) if char in VOWELS),
+        len(word),
+    )
+    prefix, rv = word[:start], word[start:]
+    if PERFECTIVE_GERUND.search(rv):
+        rv = PERFECTIVE_GERUND.sub('', rv)
+    else:
+        rv = REFLEXIVE.sub('', rv)
+        if ADJECTIVE.search(rv):
+            rv = PARTICIPLE.sub('', ADJECTIVE.sub('', rv))
+        elif VERB.search(rv):
+            rv = VERB.sub('', rv)
+        else:
+            rv = NOUN.sub('', rv)
+    rv = SUPERLATIVE.sub('', re.sub('и$', '', rv))
+    if rv.endswith('нн'):
+        rv = rv[:-1]
+    return prefix + re.sub('ь$', '', rv)
+
+
+def normalize(text: str) -> List[str]:
+    """Разбивает текст на основы слов.
+
+    Args:
+        text: Исходный текст.
+
+    Returns:
+        Список основ.
+    """
+    return [stem(word) for word in WORD.findall(text.lower())]
@@ -0,0 +1,63 @@
+from typing import List, Optional
+
+from core.tasks import task
+from posts import feed, search, thumbnails
+from posts.models import Follow, Post
+
+
+@task
+def push_post(post_id: int) -> None:
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        feed.push_post(post)
+
+
+@task
+def backfill_feed(user_id: int, author_id: int) -> None:
+    # Пока задача ждала в очереди, пользователь мог отписаться.
+    if Follow.objects.filter(user_id=user_id, author_id=author_id).exists():
+        feed.backfill(user_id, author_id)
+
+
+@task
+def catch_up_feed(author_id: int) -> None:
+    feed.catch_up(author_id)
+
+
+@task
+def generate_thumbnail(post_id: int) -> None:
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        thumbnails.generate(post)
+
+
+@task
+def index_post(post_id: int) -> None:
+    search.index_post(post_id)
+
+
+@task
+def index_comment(comment_id: int) -> None:
+    search.index_comment(comment_id)
+
+
+@task
+def delete_posts(ids: List[int]) -> None:
+    Post.objects.filter(pk__in=ids).delete()
+
+
+@task
+def set_group(ids: List[int], group_id: Optional[int]) -> None:
+    # Посты сохраняются по одному, чтобы сработали сигналы счётчиков.
+    for post in Post.objects.filter(pk__in=ids).exclude(group_id=group_id):
+        post.group_id = group_id
+        post.save()
+
+
+@task
+def clear_images(ids: List[int]) -> None:
+    for post in Post.objects.filter(pk__in=ids).exclude(image=''):
+        post.image = ''
+        post.thumbnail_url = ''
+        post.thumbnail_width = post.thumbnail_height = None
+        post.save()
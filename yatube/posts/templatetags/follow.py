@@ -0,0 +1,26 @@
+from django import template
+
+from posts.models import Follow
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def is_following(context: template.Context, username: str) -> bool:
+    """Проверяет, подписан ли текущий пользователь на автора.
+
+    Args:
+        context: Контекст шаблона.
+        username: Имя автора.
+
+    Returns:
+        True, если пользователь подписан на автора.
+    """
+    user = context['user']
+    return (
+        user.is_authenticated
+        and Follow.objects.filter(
+            user=user,
+            author__username=username,
+        ).exists()
+    )
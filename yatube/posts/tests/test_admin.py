@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from core.models import Batch
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class AdminChangelistTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser('admin', '', 'password')
+
+    def setUp(self) -> None:
+        self.client = Client()
+        self.client.force_login(self.admin)
+        # Пользователь попадает в кэш при первом запросе.
+        self.client.get(reverse('admin:index'))
+
+    def count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        return len(context)
+
+    def test_constant_queries(self) -> None:
+        """Число запросов списка не зависит от числа строк."""
+        for model in ('post', 'comment', 'follow'):
+            with self.subTest(model=model):
+                url = reverse(f'admin:posts_{model}_changelist')
+                mixer.blend(f'posts.{model.title()}')
+                queries = self.count_queries(url)
+                mixer.cycle(5).blend(f'posts.{model.title()}')
+                self.assertEqual(self.count_queries(url), queries)
+
+    def test_follow_search(self) -> None:
+        """Подписки ищутся по точному имени пользователя или автора."""
+        follow = mixer.blend('posts.Follow')
+        mixer.blend('posts.Follow')
+        response = self.client.get(
+            reverse('admin:posts_follow_changelist'),
+            {'q': follow.author.username},
+        )
+        self.assertEqual(
+            list(response.context['cl'].result_list),
+            [follow],
+        )
+
+
+class AdminBatchActionsTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser('admin', '', 'password')
+        cls.group = mixer.blend('posts.Group')
+
+    def setUp(self) -> None:
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.posts = mixer.cycle(3).blend(
+            'posts.Post',
+            image='posts/image.jpg',
+            thumbnail_url='/media/cache/image.jpg',
+        )
+        mixer.blend('posts.Comment', post=self.posts[0])
+
+    def run_action(self, action: str, **data) -> None:
+        with self.settings(ADMIN_BATCH_SIZE=2, ADMIN_BATCH_PAUSE=0):
+            response = self.client.post(
+                reverse('admin:posts_post_changelist'),
+                {
+                    'action': action,
+                    '_selected_action': [post.pk for post in self.posts],
+                    **data,
+                },
+            )
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        batch = Batch.objects.get()
+        self.assertEqual((batch.done, batch.total), (3, 3))
+
+    def test_delete_posts(self) -> None:
+        """Посты удаляются вместе с комментариями."""
+        self.run_action('delete_posts')
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+
+    def test_set_group(self) -> None:
+        """Посты переносятся в группу, счётчик группы обновляется."""
+        self.run_action('set_group', group=self.group.pk)
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 3)
+        self.assertEqual(Group.objects.get(pk=self.group.pk).posts_count, 3)
+
+    def test_set_group_requires_group(self) -> None:
+        """Без выбранной группы посты не переносятся."""
+        Post.objects.update(group=self.group)
+        response = self.client.post(
+            reverse('admin:posts_post_changelist'),
+            {
+                'action': 'set_group',
+                '_selected_action': [post.pk for post in self.posts],
+                'group': '',
+            },
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertFalse(Batch.objects.exists())
+        self.assertEqual(Post.objects.filter(group=self.group).count(), 3)
+
+    def test_clear_images(self) -> None:
+        """У постов убираются картинки и миниатюры."""
+        self.run_action('clear_images')
+        self.assertFalse(
+            Post.objects.exclude(image='', thumbnail_url='').exists(),
+        )
+
+    def test_delete_selected_disabled(self) -> None:
+        """Удаление одной транзакцией недоступно."""
+        response = self.client.get(reverse('admin:posts_post_changelist'))
+        actions = response.context['action_form'].fields['action'].choices
+        self.assertNotIn('delete_selected', dict(actions))
@@ -0,0 +1,86 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from posts import bulk, search
+from posts.models import Comment, FeedEntry, Follow, Group, Post
+
+User = get_user_model()
+
+
+class BulkDataTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.user, cls.author = mixer.cycle(2).blend(User)
+        cls.group = mixer.blend('posts.Group')
+        cls.posts = mixer.cycle(3).blend(
+            'posts.Post',
+            author=cls.author,
+            group=cls.group,
+            image='',
+        )
+        mixer.cycle(2).blend('posts.Comment', post=cls.posts[0])
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def test_export_and_import(self) -> None:
+        """Выгрузка загружается обратно без потерь."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = str(Path(directory.name) / 'data.jsonl.gz')
+        call_command('export_data', path, stderr=StringIO())
+        posts = list(Post.objects.values_list('pk', 'text', 'created'))
+        users = User.objects.count()
+        for model in (Post, Group, User):
+            model.objects.all().delete()
+        call_command('import_data', path, stdout=StringIO())
+        self.assertEqual(
+            list(Post.objects.values_list('pk', 'text', 'created')),
+            posts,
+        )
+        self.assertEqual(User.objects.count(), users)
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertEqual(Group.objects.get().posts_count, 3)
+        self.assertEqual(
+            Post.objects.get(pk=self.posts[0].pk).comments_count,
+            2,
+        )
+        self.assertEqual(FeedEntry.objects.filter(user=self.user).count(), 3)
+        post = Post.objects.first()
+        self.assertIn(
+            post,
+            search.SearchResults(post.text, Post.objects.all())[0:10],
+        )
+
+    @mock.patch('posts.bulk.BATCH_SIZE', 2)
+    def test_import_repeated(self) -> None:
+        """Повторная загрузка порциями пропускает уже загруженное."""
+        stream = StringIO()
+        bulk.export(stream)
+        lines = stream.getvalue().splitlines()
+        Post.objects.filter(pk=self.posts[2].pk).delete()
+        bulk.load(lines)
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertEqual(Group.objects.get().posts_count, 3)
+
+    def test_import_restores_dropped_indexes(self) -> None:
+        """Загрузка создаёт индексы, оставшиеся удалёнными после сбоя."""
+        indexes = bulk.model_indexes()
+        tables = [table for table, _ in indexes.values()]
+        name = min(indexes)
+        with bulk.deferred_indexes():
+            self.assertFalse(bulk.existing_indexes(tables) & indexes.keys())
+        self.assertTrue(indexes.keys() <= bulk.existing_indexes(tables))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX "{name}"')
+        bulk.load([])
+        self.assertIn(name, bulk.existing_indexes(tables))
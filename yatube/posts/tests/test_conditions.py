@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from posts.models import Follow
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.user = mixer.blend(User)
+        cls.group = mixer.blend('posts.Group')
+        cls.post = mixer.blend('posts.Post', group=cls.group, image='')
+
+    def setUp(self) -> None:
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def check_not_modified(self, url: str, change) -> None:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        etag = response['ETag']
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            HTTPStatus.NOT_MODIFIED,
+        )
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_post_detail(self) -> None:
+        """Страница поста не отдаётся заново, пока нет комментариев."""
+        self.check_not_modified(
+            reverse('posts:post_detail', args=(self.post.pk,)),
+            lambda: mixer.blend('posts.Comment', post=self.post),
+        )
+
+    def test_profile(self) -> None:
+        """Профиль отдаётся заново после подписки на автора."""
+        self.check_not_modified(
+            reverse('posts:profile', args=(self.post.author.username,)),
+            lambda: Follow.objects.create(
+                user=self.user,
+                author=self.post.author,
+            ),
+        )
+
+    def test_group_posts(self) -> None:
+        """Страница группы отдаётся заново после удаления поста."""
+        mixer.blend('posts.Post', group=self.group, image='')
+        self.check_not_modified(
+            reverse('posts:group_list', args=(self.group.slug,)),
+            lambda: self.post.delete(),
+        )
+
+    def test_renames_change_etag(self) -> None:
+        """Страница отдаётся заново после переименования группы и автора."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+
+        def rename_group() -> None:
+            self.group.title = 'Новое название'
+            self.group.save()
+
+        def rename_author() -> None:
+            self.post.author.username = 'renamed'
+            self.post.author.save()
+
+        self.check_not_modified(url, rename_group)
+        self.check_not_modified(url, rename_author)
+
+    def test_etag_depends_on_user(self) -> None:
+        """У разных пользователей разные ETag."""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        self.assertNotEqual(
+            self.client.get(url)['ETag'],
+            Client().get(url)['ETag'],
+        )
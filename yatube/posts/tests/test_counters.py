@@ -0,0 +1,90 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from posts.models import AuthorCounter, Group, Post
+
+User = get_user_model()
+
+
+class CountersTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.author = mixer.blend(User)
+        cls.group, cls.other_group = mixer.cycle(2).blend('posts.Group')
+        cls.post = mixer.blend(
+            'posts.Post',
+            author=cls.author,
+            group=cls.group,
+        )
+
+    def check_counters(self, author: int, group: int, other: int) -> None:
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.author).posts_count,
+            author,
+        )
+        self.assertEqual(
+            Group.objects.get(pk=self.group.pk).posts_count,
+            group,
+        )
+        self.assertEqual(
+            Group.objects.get(pk=self.other_group.pk).posts_count,
+            other,
+        )
+
+    def test_post_create_and_delete(self) -> None:
+        """Счётчики постов меняются при создании и удалении поста."""
+        self.check_counters(1, 1, 0)
+        post = mixer.blend('posts.Post', author=self.author, group=self.group)
+        self.check_counters(2, 2, 0)
+        post.delete()
+        self.check_counters(1, 1, 0)
+
+    def test_post_regroup(self) -> None:
+        """При смене группы пост переходит в счётчик новой группы."""
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.other_group
+        post.save()
+        self.check_counters(1, 0, 1)
+        post.group = None
+        post.save()
+        self.check_counters(1, 0, 0)
+
+    def test_comments_count(self) -> None:
+        """Счётчик комментариев меняется при добавлении и удалении."""
+        comment = mixer.blend('posts.Comment', post=self.post)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).comments_count, 1)
+        comment.delete()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).comments_count, 0)
+
+    def test_followers_count(self) -> None:
+        """Счётчик подписчиков меняется при подписке и отписке."""
+        follow = mixer.blend('posts.Follow', author=self.author)
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.author).followers_count,
+            1,
+        )
+        follow.delete()
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.author).followers_count,
+            0,
+        )
+
+    def test_reconcile_counters(self) -> None:
+        """Команда reconcile_counters исправляет расхождения."""
+        mixer.blend('posts.Follow', author=self.author)
+        AuthorCounter.objects.update(posts_count=10, followers_count=0)
+        Group.objects.update(posts_count=5)
+        Post.objects.update(comments_count=3)
+        call_command('reconcile_counters', stdout=StringIO())
+        self.check_counters(1, 1, 0)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).comments_count, 0)
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.author).followers_count,
+            1,
+        )
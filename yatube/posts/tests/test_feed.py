@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from posts import feed, signals
+from posts.models import AuthorCounter, FeedEntry, Follow, Post
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.user, cls.author = mixer.cycle(2).blend(User)
+        cls.old_post = mixer.blend('posts.Post', author=cls.author)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_follow_backfills_feed(self) -> None:
+        """При подписке в ленту попадают уже опубликованные посты."""
+        Follow.objects.create(user=self.user, author=self.author)
+        self.assertEqual(list(feed.get_feed(self.user)), [self.old_post])
+
+    def test_follow_insert_runs_hooks(self) -> None:
+        """Подписка без сигналов обновляет счётчик и ленту так же."""
+        self.assertTrue(feed.follow(self.user.pk, self.author.pk))
+        self.assertFalse(feed.follow(self.user.pk, self.author.pk))
+        signals.follow_created(self.user.pk, self.author.pk)
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.author).followers_count,
+            1,
+        )
+        self.assertEqual(list(feed.get_feed(self.user)), [self.old_post])
+
+    def test_new_post_pushed_to_followers(self) -> None:
+        """Новый пост раскладывается по лентам подписчиков."""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = mixer.blend('posts.Post', author=self.author)
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.user, post=post).exists(),
+        )
+        self.assertEqual(
+            list(feed.get_feed(self.user)),
+            [post, self.old_post],
+        )
+
+    def test_unfollow_purges_feed(self) -> None:
+        """После отписки посты автора пропадают из ленты."""
+        Follow.objects.create(user=self.user, author=self.author)
+        Follow.objects.get(user=self.user, author=self.author).delete()
+        self.assertFalse(FeedEntry.objects.filter(user=self.user).exists())
+        self.assertFalse(feed.get_feed(self.user).exists())
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_popular_author_read_on_demand(self) -> None:
+        """Посты авторов с большим числом подписчиков читаются из Post."""
+        Follow.objects.create(user=self.user, author=self.author)
+        post = mixer.blend('posts.Post', author=self.author)
+        self.assertFalse(FeedEntry.objects.filter(post=post).exists())
+        self.assertEqual(
+            list(feed.get_feed(self.user)),
+            list(Post.objects.filter(author=self.author)),
+        )
+
+    @override_settings(FEED_FANOUT_LIMIT=1)
+    def test_author_back_to_push_catches_up(self) -> None:
+        """Посты, написанные в режиме чтения, остаются в лентах."""
+        reader = mixer.blend(User)
+        Follow.objects.create(user=self.user, author=self.author)
+        Follow.objects.create(user=reader, author=self.author)
+        post = mixer.blend('posts.Post', author=self.author)
+        self.assertFalse(FeedEntry.objects.filter(post=post).exists())
+        Follow.objects.get(user=reader, author=self.author).delete()
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.user, post=post).exists(),
+        )
+        self.assertIn(post, feed.get_feed(self.user))
@@ -4,11 +4,14 @@ import tempfile
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from mixer.backend.django import mixer
 from testdata import wrap_testdata
 
+from core import objects
 from posts.models import Comment, Post
 from posts.tests.common import image
 
@@ -69,6 +72,29 @@ class PostsFormsTests(TestCase):
         self.assertEqual(post.group.id, data['group'])
         self.assertEqual(post.image, 'posts/small.gif')
 
+    def test_thumbnail_generated_on_upload(self) -> None:
+        """Миниатюра создаётся при загрузке картинки, а не при выводе."""
+        self.user.post(
+            reverse('posts:post_create'),
+            data={'text': 'Пост с картинкой', 'image': image()},
+        )
+        post = Post.objects.get()
+        self.assertTrue(post.thumbnail_url)
+        self.assertEqual(
+            f'{post.thumbnail_width}x{post.thumbnail_height}',
+            settings.POST_THUMBNAIL_GEOMETRY,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, post.thumbnail_url)
+        self.assertFalse(
+            [
+                query
+                for query in queries.captured_queries
+                if 'thumbnail_kvstore' in query['sql']
+            ],
+        )
+
     def test_anon_can_not_create_post(self) -> None:
         """Анонимный пользователь не может создать пост."""
         data = {
@@ -115,6 +141,19 @@ class PostsFormsTests(TestCase):
         self.assertEqual(post.author, self.author)
         self.assertEqual(post.group.id, data['group'])
 
+    def test_edit_keeps_counters(self) -> None:
+        """Правка поста не затирает счётчик устаревшим значением из кэша."""
+        post = mixer.blend('posts.Post', author=self.author)
+        objects.get(Post, pk=post.pk)
+        Post.objects.filter(pk=post.pk).update(comments_count=5)
+        self.user.post(
+            reverse('posts:post_edit', kwargs={'pk': post.pk}),
+            data={'text': 'Изменяем текст поста!'},
+        )
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.text, 'Изменяем текст поста!')
+        self.assertEqual(post.comments_count, 5)
+
     def test_anon_can_not_edit_post(self) -> None:
         """Анонимный пользователь не может редактировать пост."""
         self.group = mixer.blend('posts.Group')
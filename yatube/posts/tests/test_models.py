@@ -2,6 +2,7 @@ import shutil
 import tempfile
 
 from django.conf import settings
+from django.db import IntegrityError
 from django.test import TestCase, override_settings
 from mixer.backend.django import mixer
 from testdata import wrap_testdata
@@ -160,3 +161,11 @@ class FollowModelsTests(TestCase):
                     Follow._meta.get_field(value).verbose_name,
                     expected,
                 )
+
+    def test_follow_unique(self) -> None:
+        """Повторная подписка на того же автора запрещена в базе."""
+        with self.assertRaises(IntegrityError):
+            Follow.objects.create(
+                user=self.follow.user,
+                author=self.follow.author,
+            )
@@ -9,6 +9,9 @@ from django.urls import reverse
 from mixer.backend.django import mixer
 from testdata import wrap_testdata
 
+from core.utils import KeysetPaginator
+from posts.models import Post
+
 User = get_user_model()
 
 TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
@@ -66,3 +69,39 @@ class PaginatorTests(TestCase):
                     len(self.user.get(page_name).context['page_obj']),
                     num_object,
                 )
+
+    def test_index_keyset_navigation(self) -> None:
+        """По курсорам главной страницы доступны все посты по порядку."""
+        posts = list(Post.objects.all())
+        first_page = self.user.get(reverse('posts:index')).context['page_obj']
+        self.assertFalse(first_page.has_previous())
+        second_page = self.user.get(
+            reverse('posts:index'),
+            {'cursor': first_page.next_cursor},
+        ).context['page_obj']
+        self.assertEqual(
+            list(first_page) + list(second_page),
+            posts,
+        )
+        self.assertFalse(second_page.has_next())
+        previous_page = self.user.get(
+            reverse('posts:index'),
+            {'cursor': second_page.previous_cursor},
+        ).context['page_obj']
+        self.assertEqual(list(previous_page), list(first_page))
+        self.assertFalse(previous_page.has_previous())
+
+    def test_keyset_page_is_single_query(self) -> None:
+        """Страница по курсору загружается одним запросом без COUNT."""
+        paginator = KeysetPaginator(Post.objects.all(), 5)
+        cursor = paginator.get_page(None).next_cursor
+        with self.assertNumQueries(1):
+            paginator.get_page(cursor)
+
+    def test_keyset_invalid_cursor(self) -> None:
+        """Неверный курсор ведёт на первую страницу."""
+        response = self.user.get(reverse('posts:index'), {'cursor': 'spam'})
+        self.assertEqual(
+            list(response.context['page_obj']),
+            list(Post.objects.all()[: settings.NUM_OBJECTS_ON_PAGE]),
+        )
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from posts import ranking
+from posts.models import Follow, Post, PostScore
+
+User = get_user_model()
+
+
+class RankingTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.author = mixer.blend(User)
+        cls.older, cls.newer = mixer.cycle(2).blend(
+            'posts.Post',
+            author=cls.author,
+            image='',
+        )
+
+    def setUp(self) -> None:
+        self.client = Client()
+        ranking.update()
+
+    def popular(self) -> list:
+        return list(ranking.get_popular().values_list('pk', flat=True))
+
+    def test_score_decays(self) -> None:
+        """Рейтинг падает вдвое за RANKING_HALF_LIFE секунд."""
+        now = timezone.now()
+        earlier = now - timedelta(seconds=settings.RANKING_HALF_LIFE)
+        self.assertAlmostEqual(
+            ranking.score(now, 0, 0) - ranking.score(earlier, 0, 0),
+            1,
+        )
+        self.assertGreater(
+            ranking.score(earlier, 3, 0),
+            ranking.score(now, 0, 0),
+        )
+
+    def test_comments_raise_post(self) -> None:
+        """Обсуждаемый пост поднимается после пересчёта."""
+        self.assertEqual(self.popular(), [self.newer.pk, self.older.pk])
+        mixer.cycle(3).blend('posts.Comment', post=self.older)
+        self.assertEqual(
+            list(PostScore.objects.filter(stale=True).values_list('post')),
+            [(self.older.pk,)],
+        )
+        self.assertEqual(ranking.update(), 1)
+        self.assertEqual(self.popular(), [self.older.pk, self.newer.pk])
+
+    def test_follow_marks_author_posts(self) -> None:
+        """Подписка на автора отмечает его посты к пересчёту."""
+        Follow.objects.create(user=mixer.blend(User), author=self.author)
+        self.assertEqual(PostScore.objects.filter(stale=True).count(), 2)
+        self.assertEqual(ranking.update(), 2)
+
+    def test_prune(self) -> None:
+        """Рейтинги старых постов удаляются."""
+        Post.objects.filter(pk=self.older.pk).update(
+            created=timezone.now()
+            - timedelta(seconds=settings.RANKING_HORIZON + 1),
+        )
+        call_command('rank_posts', once=True, stdout=StringIO())
+        self.assertEqual(self.popular(), [self.newer.pk])
+
+    def test_rebuild(self) -> None:
+        """Команда с --rebuild заново считает рейтинги."""
+        PostScore.objects.all().delete()
+        call_command('rank_posts', once=True, rebuild=True, stdout=StringIO())
+        self.assertEqual(self.popular(), [self.newer.pk, self.older.pk])
+
+    def test_popular_page(self) -> None:
+        """Страница популярного показывает посты по рейтингу."""
+        mixer.blend('posts.Comment', post=self.older)
+        ranking.update()
+        response = self.client.get(reverse('posts:popular'))
+        self.assertEqual(
+            [post.pk for post in response.context['page_obj']],
+            [self.older.pk, self.newer.pk],
+        )
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+from testdata import wrap_testdata
+
+from posts import search
+from posts.models import Post
+from posts.search import SearchResults
+from posts.stemming import stem
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.author = mixer.blend(User)
+        cls.cats = mixer.blend(
+            'posts.Post',
+            author=cls.author,
+            text='Рыжие котики спят на солнце',
+            image='',
+        )
+        cls.dogs = mixer.blend(
+            'posts.Post',
+            author=cls.author,
+            text='Собака гуляет в парке',
+            image='',
+        )
+
+    def search(self, query: str) -> list:
+        return list(SearchResults(query, Post.objects.all())[0:10])
+
+    def test_stem(self) -> None:
+        """Разные формы слова приводятся к одной основе."""
+        self.assertEqual(stem('котики'), stem('котиков'))
+        self.assertEqual(stem('собака'), stem('собаками'))
+
+    def test_search_by_word_forms(self) -> None:
+        """Пост находится по другой форме слова."""
+        self.assertEqual(self.search('котиков'), [self.cats])
+        self.assertEqual(self.search('собаками в парке'), [self.dogs])
+        self.assertEqual(self.search('кошка'), [])
+
+    def test_index_updated(self) -> None:
+        """Индекс обновляется при изменении, комментарии и удалении."""
+        self.dogs.text = 'Кот гуляет'
+        self.dogs.save()
+        self.assertEqual(self.search('собака'), [])
+        mixer.blend('posts.Comment', post=self.cats, text='Чудесный пёс')
+        self.assertEqual(self.search('пёс'), [self.cats])
+        self.cats.delete()
+        self.assertEqual(self.search('пёс'), [])
+
+    @mock.patch('posts.search.BATCH_SIZE', 1)
+    def test_rebuild_in_batches(self) -> None:
+        """Индекс перестраивается порциями без потери записей."""
+        search.rebuild()
+        self.assertEqual(self.search('котики'), [self.cats])
+        self.assertEqual(self.search('собака'), [self.dogs])
+
+    def test_search_page(self) -> None:
+        """Страница поиска показывает найденные посты."""
+        response = self.client.get(reverse('posts:search'), {'q': 'котик'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(list(response.context['page_obj']), [self.cats])
+        self.assertEqual(response.context['page_obj'].paginator.count, 1)
@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from posts import search
+from posts.models import AuthorCounter, Comment, FeedEntry, Follow, Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class SeedTests(TestCase):
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def test_seed(self) -> None:
+        """Команда seed создаёт связанные данные и служебные таблицы."""
+        call_command(
+            'seed',
+            users=10,
+            groups=2,
+            posts=30,
+            comments=50,
+            images=0.5,
+            stdout=StringIO(),
+        )
+        self.assertEqual(User.objects.count(), 10)
+        self.assertEqual(Post.objects.count(), 30)
+        self.assertEqual(Comment.objects.count(), 50)
+        self.assertTrue(Follow.objects.exists())
+        self.assertEqual(
+            sum(AuthorCounter.objects.values_list('posts_count', flat=True)),
+            30,
+        )
+        self.assertEqual(
+            FeedEntry.objects.count(),
+            Post.objects.filter(author__following__isnull=False).count(),
+        )
+        self.assertFalse(
+            Post.objects.exclude(image='').filter(thumbnail_url='').exists(),
+        )
+        post = Post.objects.first()
+        self.assertIn(
+            post,
+            search.SearchResults(post.text, Post.objects.all())[0:30],
+        )
+
+    def test_seed_spreads_dates_and_keeps_feeds(self) -> None:
+        """Даты постов различаются, а существующие ленты сохраняются."""
+        call_command('seed', users=10, posts=30, images=0, stdout=StringIO())
+        self.assertEqual(
+            Post.objects.values('created').distinct().count(),
+            30,
+        )
+        self.assertFalse(
+            Comment.objects.filter(created__lt=F('post__created')).exists(),
+        )
+        entries = set(FeedEntry.objects.values_list('pk', flat=True))
+        call_command(
+            'seed',
+            users=5,
+            groups=0,
+            posts=10,
+            images=0,
+            seed=1,
+            stdout=StringIO(),
+        )
+        self.assertLessEqual(
+            entries,
+            set(FeedEntry.objects.values_list('pk', flat=True)),
+        )
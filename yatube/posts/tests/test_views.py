@@ -5,12 +5,15 @@ from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import connection
+from django.template.loader import render_to_string
 from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from mixer.backend.django import mixer
 from testdata import wrap_testdata
 
-from posts.models import Follow, Post
+from posts.models import AuthorCounter, FeedEntry, Follow, Post
 from posts.tests.common import image
 
 User = get_user_model()
@@ -91,6 +94,49 @@ class PostsViewsTests(TestCase):
             self.post,
         )
 
+    def test_post_detail_queries_do_not_grow_with_comments(self) -> None:
+        """Число запросов post_detail не зависит от числа комментариев."""
+        post = mixer.blend(
+            'posts.Post',
+            author=self.author,
+            group=self.group,
+            image='',
+        )
+        url = reverse('posts:post_detail', kwargs={'pk': post.pk})
+        mixer.blend('posts.Comment', post=post)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        mixer.cycle(20).blend('posts.Comment', post=post)
+        cache.clear()
+        with self.assertNumQueries(len(queries)):
+            self.client.get(url)
+
+    def test_post_detail_comments_paginated(self) -> None:
+        """Комментарии поста выводятся порциями и догружаются по курсору."""
+        comments = mixer.cycle(settings.NUM_COMMENTS_ON_PAGE + 5).blend(
+            'posts.Comment',
+            post=self.post,
+        )
+        first_page = self.client.get(
+            reverse('posts:post_detail', kwargs={'pk': self.post.pk}),
+        ).context['comments']
+        self.assertEqual(len(first_page), settings.NUM_COMMENTS_ON_PAGE)
+        response = self.client.get(
+            reverse('posts:post_comments', kwargs={'pk': self.post.pk}),
+            {'cursor': first_page.next_cursor},
+        )
+        self.assertTemplateUsed(response, 'posts/includes/comments.html')
+        self.assertFalse(response.context['comments'].has_next())
+        self.assertEqual(
+            list(first_page) + list(response.context['comments']),
+            sorted(
+                comments,
+                key=lambda comment: (comment.created, comment.pk),
+                reverse=True,
+            ),
+        )
+
     def test_post_edit_page_show_correct_context(self) -> None:
         """Шаблон post_edit сформирован с правильным контекстом."""
         response = self.author_user.get(
@@ -175,10 +221,7 @@ class PostsViewsTests(TestCase):
     def test_cache(self) -> None:
         """Тестирование кэша."""
         posts = self.author_user.get(reverse('posts:index')).content
-        self.post = mixer.blend(
-            'posts.Post',
-            author=self.post.author,
-        )
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
         self.assertEqual(
             self.author_user.get(reverse('posts:index')).content,
             posts,
@@ -189,6 +232,36 @@ class PostsViewsTests(TestCase):
             posts,
         )
 
+    def test_cache_invalidated_on_post_changes(self) -> None:
+        """Кэш главной страницы сбрасывается при изменении постов."""
+        posts = self.author_user.get(reverse('posts:index')).content
+        self.post = mixer.blend(
+            'posts.Post',
+            author=self.post.author,
+        )
+        created = self.author_user.get(reverse('posts:index')).content
+        self.assertNotEqual(created, posts)
+        self.post.delete()
+        self.assertEqual(
+            self.author_user.get(reverse('posts:index')).content,
+            posts,
+        )
+
+    def test_post_card_cached_until_modified(self) -> None:
+        """Карточка поста кэшируется, пока пост не изменён."""
+
+        def render_card() -> str:
+            return render_to_string(
+                'posts/includes/post.html',
+                {'post': Post.objects.get(pk=self.post.pk)},
+            )
+
+        card = render_card()
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
+        self.assertEqual(render_card(), card)
+        Post.objects.get(pk=self.post.pk).save()
+        self.assertIn('Новый текст', render_card())
+
     def test_authorized_user_can_following_and_unfollowing(self) -> None:
         """Подписки работают корректно.
 
@@ -261,6 +334,21 @@ class PostsViewsTests(TestCase):
             ),
         )
 
+    def test_repeated_follow_counted_once(self) -> None:
+        """Повторная подписка не меняет счётчик и ленту."""
+        url = reverse('posts:profile_follow', kwargs={'username': self.author})
+        self.authorized_user.post(url)
+        self.authorized_user.post(url)
+        self.assertEqual(Follow.objects.count(), 1)
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.author).followers_count,
+            1,
+        )
+        self.assertEqual(
+            FeedEntry.objects.filter(user=self.user).count(),
+            Post.objects.filter(author=self.author).count(),
+        )
+
     def test_cannot_subscribe_yourself(self) -> None:
         """Нельзя подписаться на самого себя."""
         self.assertEqual(
@@ -318,3 +406,60 @@ class PostsViewsTests(TestCase):
             Follow.objects.count(),
             settings.CHECK_ZERO_OBJECTS_FOR_TEST,
         )
+
+
+class SharedPageCacheTests(TestCase):
+    @classmethod
+    @wrap_testdata
+    def setUpTestData(cls) -> None:
+        cls.user, cls.author = mixer.cycle(2).blend(User)
+        cls.post = mixer.blend('posts.Post', author=cls.author, image='')
+        Follow.objects.create(user=cls.user, author=cls.author)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.follower = Client()
+        self.follower.force_login(self.user)
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def test_page_shared_between_users(self) -> None:
+        """Страница из кэша отдаётся всем со своей шапкой."""
+        url = reverse('posts:index')
+        self.follower.get(url)
+        self.author_client.get(reverse('about:author'))
+        with self.assertNumQueries(0):
+            response = self.author_client.get(url)
+        self.assertContains(response, f'Пользователь: {self.author}')
+        self.assertNotContains(response, f'Пользователь: {self.user}')
+        self.assertContains(self.client.get(url), 'Регистрация')
+
+    def test_follow_button_rendered_per_user(self) -> None:
+        """Кнопка подписки в профиле из кэша зависит от пользователя."""
+        url = reverse('posts:profile', args=(self.author.username,))
+        self.assertContains(self.follower.get(url), 'Отписаться')
+        response = self.client.get(url)
+        self.assertNotContains(response, 'Отписаться')
+        self.assertNotContains(response, 'Подписаться')
+        self.assertContains(self.author_client.get(url), 'Подписаться')
+
+    def test_author_rename_invalidates(self) -> None:
+        """Смена имени автора сбрасывает кэш его профиля."""
+        url = reverse('posts:profile', args=(self.author.username,))
+        self.client.get(url)
+        self.author.first_name = 'Новое имя'
+        self.author.save()
+        self.assertContains(self.client.get(url), 'Новое имя')
+
+    def test_missing_pages_without_queries(self) -> None:
+        """Повторный запрос несуществующих страниц не обращается к базе."""
+        urls = (
+            reverse('posts:profile', args=('nobody',)),
+            reverse('posts:group_list', args=('nothing',)),
+            reverse('posts:post_detail', args=(self.post.pk + 1,)),
+        )
+        for url in urls:
+            self.assertEqual(self.client.get(url).status_code, 404)
+        with self.assertNumQueries(0):
+            for url in urls:
+                self.assertEqual(self.client.get(url).status_code, 404)
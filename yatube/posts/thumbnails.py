@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.utils import timezone
+from sorl.thumbnail import get_thumbnail
+
+from core import objects
+from core.cache import bump_generation
+from posts.models import Post
+
+
+def generate(post: Post) -> None:
+    """Создаёт миниатюру картинки поста и сохраняет её адрес и размеры.
+
+    Шаблоны выводят сохранённые поля и не обрабатывают картинки
+    во время запроса.
+
+    Args:
+        post: Пост, картинка которого загружена или изменена.
+    """
+    thumbnail = {
+        'thumbnail_url': '',
+        'thumbnail_width': None,
+        'thumbnail_height': None,
+    }
+    if post.image:
+        image = get_thumbnail(
+            post.image,
+            settings.POST_THUMBNAIL_GEOMETRY,
+            crop='center',
+            upscale=True,
+        )
+        thumbnail = {
+            'thumbnail_url': image.url,
+            'thumbnail_width': image.width,
+            'thumbnail_height': image.height,
+        }
+    # modified обновляется, чтобы сбросить кэш карточки и ETag.
+    Post.objects.filter(pk=post.pk).update(
+        modified=timezone.now(),
+        **thumbnail,
+    )
+    objects.forget_pk(Post, post.pk)
+    for field, value in thumbnail.items():
+        setattr(post, field, value)
+    bump_generation('index_page', 'post_page')
@@ -10,6 +10,11 @@ urlpatterns = [
         views.index,
         name='index',
     ),
+    path(
+        'popular/',
+        views.popular,
+        name='popular',
+    ),
     path(
         'group/<slug:slug>/',
         views.group_posts,
@@ -25,6 +30,16 @@ urlpatterns = [
         views.post_detail,
         name='post_detail',
     ),
+    path(
+        'posts/<int:pk>/comments/',
+        views.post_comments,
+        name='post_comments',
+    ),
+    path(
+        'search/',
+        views.search,
+        name='search',
+    ),
     path(
         'create/',
         views.post_create,
@@ -1,15 +1,37 @@
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
 
+from core import objects, routers
+from core.cache import cache_page_on
 from core.utils import paginate
+from posts import conditions, counters, feed, ranking, signals
 from posts.forms import CommentForm, PostForm
-from posts.models import Follow, Group, Post, User
+from posts.models import AuthorCounter, Comment, Follow, Group, Post, User
+from posts.search import SearchResults
 
 
-@cache_page(settings.CACHE_TIMEOUT, key_prefix='index_page')
+def get_author(**lookup) -> User:
+    """Возвращает автора вместе со счётчиками из кэша объектов.
+
+    Args:
+        lookup: Условие поиска автора: pk или username.
+
+    Returns:
+        Автор.
+    """
+    author = objects.get_or_404(User, **lookup)
+    counter = objects.get(AuthorCounter, pk=author.pk)
+    if counter is not None:
+        author.counter = counter
+    return author
+
+
+@cache_page_on('index_page')
 def index(request: HttpRequest) -> HttpResponse:
     return render(
         request,
@@ -17,14 +39,32 @@ def index(request: HttpRequest) -> HttpResponse:
         {
             'page_obj': paginate(
                 request,
-                Post.objects.select_related('author'),
+                Post.objects.select_related('author', 'group'),
+                keyset=True,
+            ),
+        },
+    )
+
+
+@cache_page_on('popular_page')
+def popular(request: HttpRequest) -> HttpResponse:
+    return render(
+        request,
+        'posts/popular.html',
+        {
+            'page_obj': paginate(
+                request,
+                ranking.get_popular().select_related('author', 'group'),
+                keyset=True,
             ),
         },
     )
 
 
+@condition(etag_func=conditions.group_etag)
+@cache_page_on('index_page')
 def group_posts(request: HttpRequest, slug: str) -> HttpResponse:
-    group = get_object_or_404(Group, slug=slug)
+    group = objects.get_or_404(Group, slug=slug)
     return render(
         request,
         'posts/group_list.html',
@@ -32,41 +72,84 @@ def group_posts(request: HttpRequest, slug: str) -> HttpResponse:
             'page_obj': paginate(
                 request,
                 group.posts.select_related('author', 'group'),
+                count=group.posts_count,
             ),
             'group': group,
         },
     )
 
 
+@condition(etag_func=conditions.profile_etag)
+@cache_page_on('index_page')
 def profile(request: HttpRequest, username: str) -> HttpResponse:
-    users = get_object_or_404(User, username=username)
-    following = (
-        request.user.is_authenticated
-        and users.following.filter(user=request.user).exists()
-    )
+    users = get_author(username=username)
     return render(
         request,
         'posts/profile.html',
         {
             'page_obj': paginate(
                 request,
-                users.posts.select_related('author'),
+                users.posts.select_related('author', 'group'),
+                count=counters.author_posts(users),
             ),
             'users': users,
-            'following': following,
         },
     )
 
 
+@condition(etag_func=conditions.post_detail_etag)
 def post_detail(request: HttpRequest, pk: int) -> HttpResponse:
-    posts = get_object_or_404(Post, pk=pk)
+    posts = objects.get_or_404(Post, pk=pk)
+    posts.author = get_author(pk=posts.author_id)
+    if posts.group_id:
+        posts.group = objects.get(Group, pk=posts.group_id)
     return render(
         request,
         'posts/post_detail.html',
         {
             'posts': posts,
             'form': CommentForm(),
-            'comments': posts.comments.select_related('post'),
+            'comments': paginate(
+                request,
+                posts.comments.select_related('author'),
+                settings.NUM_COMMENTS_ON_PAGE,
+                keyset=True,
+            ),
+        },
+    )
+
+
+def post_comments(request: HttpRequest, pk: int) -> HttpResponse:
+    return render(
+        request,
+        'posts/includes/comments.html',
+        {
+            'post_pk': pk,
+            'comments': paginate(
+                request,
+                Comment.objects.filter(post_id=pk).select_related('author'),
+                settings.NUM_COMMENTS_ON_PAGE,
+                keyset=True,
+            ),
+        },
+    )
+
+
+def search(request: HttpRequest) -> HttpResponse:
+    query = request.GET.get('q', '').strip()
+    return render(
+        request,
+        'posts/search.html',
+        {
+            'page_obj': paginate(
+                request,
+                SearchResults(
+                    query,
+                    Post.objects.select_related('author', 'group'),
+                ),
+            ),
+            'query': query,
+            'page_query': urlencode({'q': query}) + '&',
         },
     )
 
@@ -92,36 +175,40 @@ def post_create(request: HttpRequest) -> HttpResponse:
 
 @login_required
 def post_edit(request: HttpRequest, pk: int) -> HttpResponse:
-    posts = get_object_or_404(Post, pk=pk)
-    if posts.author != request.user:
-        return redirect(
-            'posts:post_detail',
-            posts.pk,
-        )
-    form = PostForm(
-        request.POST or None,
-        files=request.FILES or None,
-        instance=posts,
-    )
-    if not form.is_valid():
-        return render(
-            request,
-            'posts/create_post.html',
-            {
-                'form': form,
-                'is_edit': True,
-            },
+    # Форма сохраняет все поля поста, поэтому он читается из основной
+    # базы под блокировкой, а не из кэша объектов: иначе поверх
+    # изменений запишутся устаревшие счётчик комментариев и миниатюра.
+    with transaction.atomic():
+        posts = get_object_or_404(Post.objects.select_for_update(), pk=pk)
+        if posts.author_id != request.user.pk:
+            return redirect(
+                'posts:post_detail',
+                posts.pk,
+            )
+        form = PostForm(
+            request.POST or None,
+            files=request.FILES or None,
+            instance=posts,
         )
-    form.save()
-    return redirect(
-        'posts:post_detail',
-        posts.pk,
+        if form.is_valid():
+            form.save()
+            return redirect(
+                'posts:post_detail',
+                posts.pk,
+            )
+    return render(
+        request,
+        'posts/create_post.html',
+        {
+            'form': form,
+            'is_edit': True,
+        },
     )
 
 
 @login_required
 def add_comment(request: HttpRequest, pk: int) -> HttpResponse:
-    posts = get_object_or_404(Post, pk=pk)
+    posts = objects.get_or_404(Post, pk=pk)
     form = CommentForm(request.POST or None)
     if not form.is_valid():
         return redirect('posts:post_detail', pk=pk)
@@ -142,7 +229,11 @@ def follow_index(request: HttpRequest) -> HttpResponse:
         {
             'page_obj': paginate(
                 request,
-                Post.objects.filter(author__following__user=request.user),
+                feed.get_feed(request.user).select_related(
+                    'author',
+                    'group',
+                ),
+                keyset=True,
             ),
         },
     )
@@ -150,15 +241,12 @@ def follow_index(request: HttpRequest) -> HttpResponse:
 
 @login_required
 def profile_follow(request: HttpRequest, username: str) -> HttpResponse:
-    author = get_object_or_404(User, username=username)
-    if (
-        request.user != author
-        and not Follow.objects.filter(
-            user=request.user,
-            author=author,
-        ).exists()
-    ):
-        Follow.objects.create(user=request.user, author=author)
+    author = objects.get_or_404(User, username=username)
+    if request.user != author:
+        with transaction.atomic():
+            if feed.follow(request.user.pk, author.pk):
+                signals.follow_created(request.user.pk, author.pk)
+        routers.mark_written(request)
     return redirect(
         'posts:profile',
         username,
@@ -170,8 +258,9 @@ def profile_unfollow(request: HttpRequest, username: str) -> HttpResponse:
     get_object_or_404(
         Follow,
         user=request.user,
-        author__username=username,
+        author=objects.get_or_404(User, username=username),
     ).delete()
+    routers.mark_written(request)
     return redirect(
         'posts:profile',
         username,
@@ -1,4 +1,8 @@
+import atexit
 import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -9,9 +13,91 @@ CHECK_ONE_OBJECT_FOR_TEST = 1
 
 NUM_OBJECTS_ON_PAGE = 10
 
+NUM_COMMENTS_ON_PAGE = 20
+
 STR_LENGTH_WHEN_PRINTING_MODEL = 15
 
-CACHE_TIMEOUT = 20
+POST_THUMBNAIL_GEOMETRY = '960x339'
+
+CACHE_TIMEOUT = 60 * 60
+
+CACHE_STALE_TIMEOUT = 60 * 60 * 24
+
+CACHE_LOCK_TIMEOUT = 10
+
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+CACHE_MAX_ENTRIES = 100000
+
+CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+FEED_FANOUT_LIMIT = 1000
+
+FEED_BACKFILL_LIMIT = 1000
+
+FEED_BATCH_SIZE = 500
+
+FEED_PULL_AUTHORS_TIMEOUT = 60 * 5
+
+RANKING_HALF_LIFE = 60 * 60 * 12
+
+RANKING_WINDOW = 60 * 60 * 24
+
+RANKING_HORIZON = 60 * 60 * 24 * 7
+
+RANKING_COMMENT_WEIGHT = 1.0
+
+RANKING_FOLLOWER_WEIGHT = 0.5
+
+RANKING_BATCH_SIZE = 500
+
+RANKING_INTERVAL = 60
+
+TASKS_WORKERS = 4
+
+TASKS_MAX_ATTEMPTS = 5
+
+TASKS_RETRY_DELAY = 10
+
+TASKS_POLL_INTERVAL = 1
+
+TASKS_VISIBILITY_TIMEOUT = 60 * 10
+
+TASKS_KEEP_DONE = 60 * 60 * 24
+
+ADMIN_COUNT_LIMIT = 10000
+
+ADMIN_BATCH_SIZE = 200
+
+ADMIN_BATCH_PAUSE = 0.1
+
+PROFILING_MAX_QUERIES = 30
+
+PROFILING_MAX_DURATION = 0.5
+
+PROFILING_SAMPLES = 1000
+
+PROFILING_FLUSH_INTERVAL = 10
+
+PROFILING_RETENTION = 60 * 60
+
+PROFILING_PERCENTILES = (50, 95, 99)
+
+REPLICA_STICKY_TIMEOUT = 10
+
+USER_CACHE_TIMEOUT = 60 * 60
+
+OBJECT_CACHE_TIMEOUT = 60 * 60
+
+OBJECT_CACHE_MISSING_TIMEOUT = 60
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
 
@@ -26,6 +112,11 @@ DEBUG = os.getenv('DEBUG') == 'True'
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS').split(' ')
 
+# Тесты запускаются через manage.py test или pytest.
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
+TASKS_ALWAYS_EAGER = TESTING or os.getenv('TASKS_ALWAYS_EAGER') == 'True'
+
 # fmt: off
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -36,6 +127,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
     'core.apps.CoreConfig',
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
@@ -46,6 +138,8 @@ INSTALLED_APPS = [
 # fmt: on
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.PrimaryPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,7 +156,7 @@ TEMPLATES_DIR = BASE_DIR / 'templates'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backends.ProfilingTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -83,9 +177,28 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': str(BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 60)),
     },
 }
 
+for number, name in enumerate(os.getenv('DATABASE_REPLICAS', '').split(), 1):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+REPLICA_STICKY_COOKIE = 'use_primary'
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -117,7 +230,9 @@ LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'core.mail.TaskEmailBackend'
+
+TASKS_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = str(BASE_DIR / 'sent_emails')
 
@@ -129,10 +244,24 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache_backends.SQLiteCache',
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION',
+            str(BASE_DIR / 'cache.sqlite3'),
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': CACHE_MAX_ENTRIES,
+            'MAX_SIZE': CACHE_MAX_SIZE,
+        },
     },
 }
 
+if TESTING:
+    # Тесты не пишут в рабочий файл кэша.
+    TEST_CACHE_DIR = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, TEST_CACHE_DIR, True)
+    CACHES['default']['LOCATION'] = str(Path(TEST_CACHE_DIR) / 'cache.sqlite3')
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -13,6 +13,10 @@ urlpatterns = [
         'about/',
         include('about.urls', namespace=apps.get_app_config('about').name),
     ),
+    path(
+        'api/v1/',
+        include('api.urls', namespace=apps.get_app_config('api').name),
+    ),
     path(
         'admin/',
         admin.site.urls,